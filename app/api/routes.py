@@ -1,8 +1,9 @@
 """API routes."""
 
+import hashlib
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 
 from app.api.schemas import (
     ChatRequest,
@@ -21,6 +22,7 @@ from app.api.schemas import (
 )
 from app.api.sessions import SessionStore
 from app.config import get_settings
+from app.core import SkillRegistry
 from app.dependencies import (
     get_business_connector,
     get_llm_provider,
@@ -34,6 +36,12 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Skills are registered at startup, so the listing can be reused by clients
+_SKILLS_CACHE_CONTROL = "private, max-age=60"
+
+# Serialized /skills body and ETag, tagged with the registry state they reflect
+_skills_listing: tuple[SkillRegistry, int, bytes, str] | None = None
+
 
 # Health & Info
 
@@ -43,18 +51,35 @@ router = APIRouter()
     response_model=HealthResponse,
     tags=["Health"],
 )
-async def health_check() -> HealthResponse:
-    """Check application health status."""
+async def health_check(request: Request) -> HealthResponse:
+    """Check application health status.
+
+    Reports degraded while knowledge ingestion is still running at startup
+    (knowledge_status "loading") or has failed and is being retried
+    ("failed"). Apps run without the lifespan never start ingestion, so
+    there the knowledge store is read directly and does not affect the
+    status.
+    """
     settings = get_settings()
     provider = get_llm_provider()
     registry = get_skill_registry()
 
-    # Check RAG/knowledge store
-    try:
-        rag_manager = get_rag_manager()
-        doc_count = rag_manager.document_count
-    except Exception:
-        doc_count = 0
+    # Check RAG/knowledge store, unless background ingestion is still running
+    rag_ready = getattr(request.app.state, "rag_ready", None)
+    if rag_ready is None:
+        knowledge_status = None
+    elif rag_ready:
+        knowledge_status = "ready"
+    elif getattr(request.app.state, "rag_error", None):
+        knowledge_status = "failed"
+    else:
+        knowledge_status = "loading"
+    doc_count = 0
+    if rag_ready is not False:
+        try:
+            doc_count = get_rag_manager().document_count
+        except Exception:
+            doc_count = 0
 
     # Check business database connectivity
     try:
@@ -64,7 +89,7 @@ async def health_check() -> HealthResponse:
         business_db_healthy = False
 
     return HealthResponse(
-        status="healthy" if business_db_healthy else "degraded",
+        status="healthy" if business_db_healthy and rag_ready is not False else "degraded",
         version=settings.app_version,
         environment=settings.env,
         llm_provider=provider.provider_name,
@@ -72,6 +97,7 @@ async def health_check() -> HealthResponse:
         skills_count=registry.skill_count,
         tools_count=registry.tool_count,
         knowledge_documents=doc_count,
+        knowledge_status=knowledge_status,
         business_db_healthy=business_db_healthy,
     )
 
@@ -81,9 +107,31 @@ async def health_check() -> HealthResponse:
     response_model=SkillsResponse,
     tags=["Info"],
 )
-async def list_skills() -> SkillsResponse:
-    """List all registered skills and their tools."""
+async def list_skills(request: Request) -> Response:
+    """List all registered skills and their tools.
+
+    The body is serialized once per registry state and reused. It carries an
+    ETag of its content; a matching If-None-Match gets an empty 304 instead.
+    """
+    global _skills_listing
+
     registry = get_skill_registry()
+    if (
+        _skills_listing is None
+        or _skills_listing[0] is not registry
+        or _skills_listing[1] != registry.version
+    ):
+        _skills_listing = (registry, registry.version, *_render_skills(registry))
+    _, _, body, etag = _skills_listing
+
+    headers = {"ETag": etag, "Cache-Control": _SKILLS_CACHE_CONTROL}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _render_skills(registry: SkillRegistry) -> tuple[bytes, str]:
+    """Serialize the skill listing and compute its ETag."""
     skills = []
     for skill in registry.get_all_skills():
         skills.append(
@@ -97,7 +145,10 @@ async def list_skills() -> SkillsResponse:
                 knowledge_paths=skill.knowledge_paths,
             )
         )
-    return SkillsResponse(skills=skills)
+    body = SkillsResponse(skills=skills).model_dump_json().encode()
+
+    digest = hashlib.blake2b(body, digest_size=8)
+    return body, f'"{digest.hexdigest()}"'
 
 
 # Chat
@@ -15,6 +15,7 @@ class HealthResponse(BaseModel):
     skills_count: int
     tools_count: int
     knowledge_documents: int
+    knowledge_status: str | None = None
     business_db_healthy: bool
 
 
@@ -1,12 +1,31 @@
 """SAP Datasphere connector with OAuth2 authentication."""
 
 import asyncio
+import re
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Any
 
 import httpx
 
+# Row limits a query already sets at top level: a trailing LIMIT n [OFFSET m]
+# or a leading SELECT [DISTINCT] TOP n. Limits inside subqueries, CTEs or
+# literals do not bound the outer result and are not matched.
+_TRAILING_LIMIT = re.compile(
+    r"\blimit\s+(\d+)(?:\s+offset\s+\d+)?\s*;?\s*\Z", re.IGNORECASE
+)
+_LEADING_TOP = re.compile(r"\A\s*select\s+(?:distinct\s+)?top\s+(\d+)\b", re.IGNORECASE)
+
+
+def _cap_rows(query: str, max_rows: int) -> str:
+    """Return query limited to at most max_rows rows."""
+    match = _TRAILING_LIMIT.search(query) or _LEADING_TOP.match(query)
+    if match and int(match.group(1)) <= max_rows:
+        return query
+    body = query.rstrip().removesuffix(";").rstrip()
+    # The newline ends a trailing -- comment before the closing parenthesis
+    return f"SELECT * FROM (\n{body}\n) AS capped LIMIT {max_rows}"
+
 
 class DatasphereError(Exception):
     """Base exception for Datasphere operations."""
@@ -17,7 +36,14 @@ class DatasphereAuthError(DatasphereError):
 
 
 class DatasphereQueryError(DatasphereError):
-    """Query execution failed."""
+    """Query execution failed.
+
+    status_code holds the HTTP status when the service rejected the request.
+    """
+
+    def __init__(self, message: str, status_code: int | None = None):
+        super().__init__(message)
+        self.status_code = status_code
 
 
 @dataclass
@@ -157,12 +183,17 @@ class DatasphereConnector:
         self,
         query: str,
         parameters: dict[str, Any] | None = None,
+        max_rows: int | None = None,
     ) -> list[dict[str, Any]]:
         """Execute a SQL query against Datasphere.
 
         Args:
             query: SQL query string
             parameters: Optional query parameters for prepared statements
+            max_rows: Optional cap applied on the server, so excess rows
+                are never sent. Queries whose own top-level LIMIT or TOP is
+                within the cap are sent unchanged; others are wrapped in an
+                outer SELECT with a LIMIT.
 
         Returns:
             List of result rows as dictionaries
@@ -175,6 +206,9 @@ class DatasphereConnector:
 
         headers = await self._get_headers()
 
+        if max_rows is not None:
+            query = _cap_rows(query, int(max_rows))
+
         payload = {"query": query}
         if parameters:
             payload["parameters"] = parameters
@@ -192,7 +226,8 @@ class DatasphereConnector:
 
         except httpx.HTTPStatusError as e:
             raise DatasphereQueryError(
-                f"Query failed: {e.response.status_code} - {e.response.text}"
+                f"Query failed: {e.response.status_code} - {e.response.text}",
+                status_code=e.response.status_code,
             ) from e
         except Exception as e:
             raise DatasphereQueryError(f"Query failed: {e}") from e
@@ -205,6 +240,7 @@ class DatasphereConnector:
         top: int | None = None,
         skip: int | None = None,
         orderby: str | None = None,
+        apply: str | None = None,
     ) -> list[dict[str, Any]]:
         """Execute an OData query against a Datasphere view/table.
 
@@ -215,6 +251,8 @@ class DatasphereConnector:
             top: Maximum number of results
             skip: Number of results to skip
             orderby: Order by expression
+            apply: OData $apply transformation (e.g. groupby/aggregate),
+                evaluated by the server before the other options
 
         Returns:
             List of result entities as dictionaries
@@ -225,17 +263,18 @@ class DatasphereConnector:
         headers = await self._get_headers()
 
         # Build OData query parameters
-        params: dict[str, str] = {}
-        if select:
-            params["$select"] = ",".join(select)
-        if filter_expr:
-            params["$filter"] = filter_expr
-        if top:
-            params["$top"] = str(top)
-        if skip:
-            params["$skip"] = str(skip)
-        if orderby:
-            params["$orderby"] = orderby
+        params: dict[str, str] = {
+            key: value
+            for key, value in (
+                ("$select", ",".join(select) if select else None),
+                ("$filter", filter_expr),
+                ("$top", str(top) if top else None),
+                ("$skip", str(skip) if skip else None),
+                ("$orderby", orderby),
+                ("$apply", apply),
+            )
+            if value
+        }
 
         url = f"{self.odata_url}/{entity}"
 
@@ -248,7 +287,8 @@ class DatasphereConnector:
 
         except httpx.HTTPStatusError as e:
             raise DatasphereQueryError(
-                f"OData query failed: {e.response.status_code} - {e.response.text}"
+                f"OData query failed: {e.response.status_code} - {e.response.text}",
+                status_code=e.response.status_code,
             ) from e
         except Exception as e:
             raise DatasphereQueryError(f"OData query failed: {e}") from e
@@ -277,7 +317,10 @@ class DatasphereConnector:
             return response.json()
 
         except httpx.HTTPStatusError as e:
-            raise DatasphereQueryError(f"Metadata query failed: {e.response.status_code}") from e
+            raise DatasphereQueryError(
+                f"Metadata query failed: {e.response.status_code}",
+                status_code=e.response.status_code,
+            ) from e
 
     async def list_entities(self) -> list[str]:
         """List available entities (views/tables) in the space."""
@@ -1,5 +1,6 @@
 """Generic async PostgreSQL connector."""
 
+from collections.abc import AsyncIterator
 from typing import Any
 
 import asyncpg
@@ -47,6 +48,58 @@ class PostgresConnector:
                 rows = await conn.fetch(query)
             return [dict(row) for row in rows]
 
+    async def execute_many(
+        self, queries: list[tuple[str, list[Any] | None]]
+    ) -> list[list[dict]]:
+        """Execute several queries on a single pooled connection.
+
+        The queries share one connection checkout and run in one read-only,
+        repeatable-read transaction, so every result sees the same snapshot.
+
+        Args:
+            queries: List of (query, params) pairs.
+
+        Returns:
+            List of row-dict lists, in the same order as queries.
+        """
+        pool = await self.get_pool()
+        async with pool.acquire() as conn:
+            async with conn.transaction(isolation="repeatable_read", readonly=True):
+                results = []
+                for query, params in queries:
+                    if params:
+                        rows = await conn.fetch(query, *params)
+                    else:
+                        rows = await conn.fetch(query)
+                    results.append([dict(row) for row in rows])
+                return results
+
+    async def stream(
+        self,
+        query: str,
+        params: list[Any] | None = None,
+        prefetch: int = 500,
+    ) -> AsyncIterator[dict]:
+        """Execute query and yield rows one at a time.
+
+        Rows come from a server-side cursor in batches of prefetch, so only
+        one batch is held in memory. The connection stays checked out until
+        the iterator is exhausted or closed.
+
+        Args:
+            query: SQL query with $1, $2, etc. placeholders.
+            params: Query parameters.
+            prefetch: Number of rows fetched per round trip.
+
+        Yields:
+            Row dictionaries.
+        """
+        pool = await self.get_pool()
+        async with pool.acquire() as conn:
+            async with conn.transaction(readonly=True):
+                async for row in conn.cursor(query, *(params or []), prefetch=prefetch):
+                    yield dict(row)
+
     async def execute_one(self, query: str, params: list[Any] | None = None) -> dict | None:
         """Execute query and return single result.
 
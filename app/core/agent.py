@@ -16,6 +16,25 @@ from langchain_core.messages import (
 from app.core.messages import Conversation, Message, MessageRole
 from app.core.registry import SkillRegistry
 
+_BASE_SYSTEM_PROMPT = """You are Skillian, an AI assistant specialized in \
+diagnosing SAP BW data issues.
+
+You have access to tools that can query SAP BW data. Use these tools to help users:
+- Analyze financial data (cost centers, profit centers, budgets)
+- Investigate data discrepancies
+- Generate reports and summaries
+
+When asked about data, use the appropriate tools to fetch real information.
+Be concise and accurate in your responses.
+"""
+
+
+# One reusable compact encoder: json.dumps builds a new encoder whenever
+# non-default options are passed, and indentation only adds tokens. Other
+# values go through str(), which keeps every digit of a Decimal (asyncpg's
+# type for NUMERIC columns) where a float would round large amounts.
+_TOOL_RESULT_ENCODER = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, default=str)
+
 
 @dataclass
 class AgentResponse:
@@ -71,23 +90,12 @@ class Agent:
 
     def _setup_system_prompt(self) -> None:
         """Set up the system prompt with skill context."""
-        base_prompt = """You are Skillian, an AI assistant specialized in \
-diagnosing SAP BW data issues.
-
-You have access to tools that can query SAP BW data. Use these tools to help users:
-- Analyze financial data (cost centers, profit centers, budgets)
-- Investigate data discrepancies
-- Generate reports and summaries
-
-When asked about data, use the appropriate tools to fetch real information.
-Be concise and accurate in your responses.
-"""
         skill_context = self.registry.get_combined_system_prompt()
 
         if skill_context:
-            full_prompt = f"{base_prompt}\n\n{skill_context}"
+            full_prompt = f"{_BASE_SYSTEM_PROMPT}\n\n{skill_context}"
         else:
-            full_prompt = base_prompt
+            full_prompt = _BASE_SYSTEM_PROMPT
 
         self.conversation.add(Message.system(full_prompt))
 
@@ -132,7 +140,7 @@ Be concise and accurate in your responses.
             # Convert result to JSON string for LLM
             if isinstance(result, str):
                 return result
-            return json.dumps(result, indent=2, default=str)
+            return _TOOL_RESULT_ENCODER.encode(result)
 
         except Exception as e:
             return json.dumps({"error": str(e)})
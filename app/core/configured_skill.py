@@ -6,12 +6,13 @@ from typing import Any
 from app.core.tool import Tool
 
 
-@dataclass
+@dataclass(slots=True)
 class ConfiguredSkill:
     """A skill loaded from SKILL.md and tools.yaml configuration.
 
     This class provides the same interface as Python-based skills
     but is populated from configuration files instead of code.
+    Uses slots since the field set is fixed once loaded.
     """
 
     name: str
@@ -28,12 +29,18 @@ class ConfiguredSkill:
     tags: list[str] = field(default_factory=list)
     connector_type: str | None = None  # Required connector
 
+    _tools_by_name: dict[str, Tool] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        # Index tools by name; the first definition wins, as with a scan
+        for tool in self.tools:
+            self._tools_by_name.setdefault(tool.name, tool)
+
     def get_tool(self, name: str) -> Tool | None:
         """Get a tool by name."""
-        for tool in self.tools:
-            if tool.name == name:
-                return tool
-        return None
+        return self._tools_by_name.get(name)
 
     def get_tool_names(self) -> list[str]:
         """Get list of all tool names."""
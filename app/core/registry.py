@@ -46,6 +46,10 @@ class SkillRegistry:
 
     _skills: dict[str, Skill] = field(default_factory=dict)
     _tool_index: dict[str, str] = field(default_factory=dict)  # tool_name -> skill_name
+    _all_tools: tuple[Tool, ...] | None = field(default=None, init=False, repr=False)
+    _system_prompt: str | None = field(default=None, init=False, repr=False)
+    _tool_descriptions: str | None = field(default=None, init=False, repr=False)
+    _version: int = field(default=0, init=False, repr=False)
 
     def register(self, skill: Skill) -> None:
         """Add a skill to the registry.
@@ -72,6 +76,7 @@ class SkillRegistry:
         self._skills[skill.name] = skill
         for tool in skill.tools:
             self._tool_index[tool.name] = skill.name
+        self._invalidate_caches()
 
     def unregister(self, skill_name: str) -> None:
         """Remove a skill from the registry.
@@ -92,6 +97,14 @@ class SkillRegistry:
             del self._tool_index[tool.name]
 
         del self._skills[skill_name]
+        self._invalidate_caches()
+
+    def _invalidate_caches(self) -> None:
+        """Drop values derived from the registered skills."""
+        self._all_tools = None
+        self._system_prompt = None
+        self._tool_descriptions = None
+        self._version += 1
 
     def get_skill(self, name: str) -> Skill:
         """Get a skill by name.
@@ -151,16 +164,20 @@ class SkillRegistry:
         skill_name = self._tool_index[tool_name]
         return self._skills[skill_name]
 
-    def get_all_tools(self) -> list[Tool]:
+    def get_all_tools(self) -> tuple[Tool, ...]:
         """Get all tools from all registered skills.
 
+        The tuple is built once and reused until a skill is registered
+        or unregistered; being immutable, it is safe to hand to callers.
+
         Returns:
-            List of all available tools.
+            Tuple of all available tools.
         """
-        tools: list[Tool] = []
-        for skill in self._skills.values():
-            tools.extend(skill.tools)
-        return tools
+        if self._all_tools is None:
+            self._all_tools = tuple(
+                tool for skill in self._skills.values() for tool in skill.tools
+            )
+        return self._all_tools
 
     def get_all_skills(self) -> list[Skill]:
         """Get all registered skills.
@@ -173,26 +190,39 @@ class SkillRegistry:
     def get_combined_system_prompt(self) -> str:
         """Combine system prompts from all skills.
 
+        Built once and reused until a skill is registered or unregistered.
+
         Returns:
             Combined system prompt with domain context from all skills.
         """
-        prompts = []
-        for skill in self._skills.values():
-            prompts.append(f"## {skill.name.title()} Domain\n{skill.system_prompt}")
-        return "\n\n".join(prompts)
+        if self._system_prompt is None:
+            self._system_prompt = "\n\n".join(
+                f"## {skill.name.title()} Domain\n{skill.system_prompt}"
+                for skill in self._skills.values()
+            )
+        return self._system_prompt
 
     def get_tool_descriptions(self) -> str:
         """Get formatted descriptions of all available tools.
 
+        Built once and reused until a skill is registered or unregistered.
+
         Returns:
             Formatted string describing all tools.
         """
-        lines = []
-        for skill in self._skills.values():
-            lines.append(f"\n### {skill.name.title()} Tools")
-            for tool in skill.tools:
-                lines.append(f"- **{tool.name}**: {tool.description}")
-        return "\n".join(lines)
+        if self._tool_descriptions is None:
+            lines = []
+            for skill in self._skills.values():
+                lines.append(f"\n### {skill.name.title()} Tools")
+                for tool in skill.tools:
+                    lines.append(f"- **{tool.name}**: {tool.description}")
+            self._tool_descriptions = "\n".join(lines)
+        return self._tool_descriptions
+
+    @property
+    def version(self) -> int:
+        """Counter bumped whenever a skill is registered or unregistered."""
+        return self._version
 
     @property
     def skill_count(self) -> int:
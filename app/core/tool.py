@@ -1,5 +1,6 @@
 """Tool definition for skills."""
 
+import asyncio
 from collections.abc import Callable
 from dataclasses import dataclass
 from typing import Any
@@ -32,8 +33,8 @@ class Tool:
         Returns:
             Tool execution result.
         """
-        # Validate inputs using Pydantic
-        validated = self.input_schema(**kwargs)
+        # Validate inputs using the schema's compiled Pydantic validator
+        validated = self.input_schema.model_validate(kwargs)
         return self.function(**validated.model_dump())
 
     async def aexecute(self, **kwargs: Any) -> Any:
@@ -42,9 +43,7 @@ class Tool:
         For async functions, awaits the result.
         For sync functions, calls directly.
         """
-        import asyncio
-
-        validated = self.input_schema(**kwargs)
+        validated = self.input_schema.model_validate(kwargs)
         result = self.function(**validated.model_dump())
 
         if asyncio.iscoroutine(result):
@@ -2,19 +2,27 @@
 
 from __future__ import annotations
 
-import asyncio
 import functools
 import importlib
 import inspect
+import json
 from pathlib import Path
 from typing import Any, Callable
 
 import yaml
-from pydantic import BaseModel, Field, create_model
+from pydantic import BaseModel, ConfigDict, Field, create_model
 
 from app.core.exception import ToolLoadError
 from app.core.tool import Tool
 
+# Tool inputs are validated once and only read afterwards
+_INPUT_MODEL_CONFIG = ConfigDict(frozen=True)
+
+# Input models keyed by tool name and parameter spec. Models are immutable,
+# so reloading a skill or binding it to another connector reuses them and
+# only rebinds the implementation function.
+_input_schema_cache: dict[tuple[str, str], type[BaseModel]] = {}
+
 
 def load_tools_from_yaml(
     yaml_path: Path | str,
@@ -88,7 +96,7 @@ def _build_tool(
     parameters = config.get("parameters", [])
 
     # Build Pydantic input schema
-    input_schema = _build_input_schema(name, parameters)
+    input_schema = _get_input_schema(name, parameters)
 
     # Get the implementation function
     if "implementation" in config:
@@ -106,6 +114,18 @@ def _build_tool(
     )
 
 
+def _get_input_schema(
+    tool_name: str,
+    parameters: list[dict[str, Any]],
+) -> type[BaseModel]:
+    """Return the input model for a tool, building it on first use."""
+    key = (tool_name, json.dumps(parameters, sort_keys=True, default=str))
+    schema = _input_schema_cache.get(key)
+    if schema is None:
+        schema = _input_schema_cache[key] = _build_input_schema(tool_name, parameters)
+    return schema
+
+
 def _build_input_schema(
     tool_name: str,
     parameters: list[dict[str, Any]],
@@ -157,7 +177,7 @@ def _build_input_schema(
 
     # Create dynamic model
     model_name = "".join(word.capitalize() for word in tool_name.split("_")) + "Input"
-    return create_model(model_name, **fields)
+    return create_model(model_name, __config__=_INPUT_MODEL_CONFIG, **fields)
 
 
 def _build_nested_schema(
@@ -188,7 +208,7 @@ def _build_nested_schema(
                 Field(default=None, description=description),
             )
 
-    return create_model(name, **fields)
+    return create_model(name, __config__=_INPUT_MODEL_CONFIG, **fields)
 
 
 def _get_python_type(type_str: str) -> type:
@@ -279,18 +299,21 @@ def _function_wants_connector(func: Callable) -> bool:
 
 
 def _wrap_with_connector(func: Callable, connector: Any) -> Callable:
-    """Wrap a function to inject connector."""
+    """Bind the connector to a function as a keyword argument.
 
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        return func(*args, connector=connector, **kwargs)
+    A connector passed at call time is dropped: tool arguments come from the
+    model and must never replace the configured connector. The wrapper
+    returns func's result unchanged, so for an async function the caller
+    awaits the coroutine directly and no extra coroutine frame is added.
+    """
 
     @functools.wraps(func)
-    async def async_wrapper(*args, **kwargs):
-        return await func(*args, connector=connector, **kwargs)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        kwargs["connector"] = connector
+        return func(*args, **kwargs)
 
-    if asyncio.iscoroutinefunction(func):
-        return async_wrapper
+    if inspect.iscoroutinefunction(func):
+        return inspect.markcoroutinefunction(wrapper)
     return wrapper
 
 
@@ -1,6 +1,14 @@
 """Database module for session persistence."""
 
-from app.db.connection import close_db, get_db_session, init_db
+from app.db.connection import close_db, get_db_session, init_db, pool_status, warm_pool
 from app.db.models import Base, SessionModel
 
-__all__ = ["Base", "SessionModel", "close_db", "get_db_session", "init_db"]
+__all__ = [
+    "Base",
+    "SessionModel",
+    "close_db",
+    "get_db_session",
+    "init_db",
+    "pool_status",
+    "warm_pool",
+]
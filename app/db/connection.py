@@ -1,39 +1,56 @@
 """Database connection and session management."""
 
+import asyncio
 from collections.abc import AsyncGenerator
+from contextlib import AsyncExitStack
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.config import get_settings
 from app.db.models import Base
 
-_engine = None
-_async_session_factory = None
+# asyncpg connections are bound to the loop that opened them, so every
+# event loop gets its own engine (and pool) instead of one module global
+_engines: dict[asyncio.AbstractEventLoop, AsyncEngine] = {}
+_session_factories: dict[asyncio.AbstractEventLoop, async_sessionmaker[AsyncSession]] = {}
 
 
-def _get_engine(force_new: bool = False):
-    """Get or create the async engine."""
-    global _engine
-    if _engine is None or force_new:
+def _get_engine() -> AsyncEngine:
+    """Get or create the async engine for the running event loop."""
+    loop = asyncio.get_running_loop()
+    engine = _engines.get(loop)
+    if engine is None:
         settings = get_settings()
-        _engine = create_async_engine(
+        engine = _engines[loop] = create_async_engine(
             settings.database_url,
             echo=settings.debug,
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
             pool_pre_ping=True,
+            pool_recycle=settings.db_pool_recycle,
         )
-    return _engine
+    return engine
 
 
-def _get_session_factory(force_new: bool = False):
-    """Get or create the session factory."""
-    global _async_session_factory
-    if _async_session_factory is None or force_new:
-        _async_session_factory = async_sessionmaker(
-            bind=_get_engine(force_new),
+def _get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Get or create the session factory for the running event loop."""
+    loop = asyncio.get_running_loop()
+    factory = _session_factories.get(loop)
+    if factory is None:
+        factory = _session_factories[loop] = async_sessionmaker(
+            bind=_get_engine(),
             class_=AsyncSession,
             expire_on_commit=False,
         )
-    return _async_session_factory
+    return factory
 
 
 async def init_db() -> None:
@@ -43,13 +60,57 @@ async def init_db() -> None:
         await conn.run_sync(Base.metadata.create_all)
 
 
+async def warm_pool(size: int) -> None:
+    """Open pooled connections ahead of the first requests.
+
+    All connections are held at once, so the pool ends up with `size`
+    distinct connections rather than reusing a single one.
+    """
+    engine = _get_engine()
+    async with AsyncExitStack() as stack:
+        # Every attempt settles before any error is raised, so each connection
+        # that did open is registered with the stack and released on exit
+        conns = _raise_first_error(
+            await asyncio.gather(
+                *(stack.enter_async_context(engine.connect()) for _ in range(size)),
+                return_exceptions=True,
+            )
+        )
+        _raise_first_error(
+            await asyncio.gather(
+                *(conn.execute(text("SELECT 1")) for conn in conns),
+                return_exceptions=True,
+            )
+        )
+
+
+def _raise_first_error(results: list) -> list:
+    """Return gathered results, raising the first exception among them."""
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return results
+
+
+def pool_status() -> str:
+    """Describe the pool's current checkouts, for logging."""
+    return _get_engine().pool.status()
+
+
 async def close_db() -> None:
-    """Close database connections."""
-    global _engine, _async_session_factory
-    if _engine is not None:
-        await _engine.dispose()
-        _engine = None
-        _async_session_factory = None
+    """Close database connections for the running event loop.
+
+    Engines left behind by loops that have since closed are dropped too.
+    """
+    loop = asyncio.get_running_loop()
+    _session_factories.pop(loop, None)
+    engine = _engines.pop(loop, None)
+    if engine is not None:
+        await engine.dispose()
+
+    for stale in [other for other in _engines if other.is_closed()]:
+        del _engines[stale]
+        _session_factories.pop(stale, None)
 
 
 async def get_db_session() -> AsyncGenerator[AsyncSession]:
@@ -1,5 +1,6 @@
 """RAG manager for coordinating knowledge retrieval."""
 
+from collections.abc import Callable
 from dataclasses import dataclass
 
 from langchain_core.documents import Document
@@ -26,15 +27,21 @@ class RAGManager:
     store: VectorStore
     registry: SkillRegistry
 
-    def ingest_all_skills(self) -> dict[str, int]:
+    def ingest_all_skills(self, stop: Callable[[], bool] | None = None) -> dict[str, int]:
         """Ingest knowledge from all registered skills.
 
+        Args:
+            stop: Optional callback checked before each skill; ingestion
+                ends early, with the skills done so far, once it returns True.
+
         Returns:
             Dictionary of skill name to chunks ingested.
         """
         results = {}
 
         for skill in self.registry.get_all_skills():
+            if stop is not None and stop():
+                break
             total_chunks = 0
             for knowledge_path in skill.knowledge_paths:
                 chunks = self.store.add_documents_from_directory(knowledge_path)
@@ -6,7 +6,7 @@ from dataclasses import dataclass, field
 from enum import StrEnum
 from typing import Any
 
-from app.skills.data_analyst.query_engine import QueryEngine, QueryResult
+from app.skills.data_analyst.query_engine import QueryEngine, QueryRequest, QueryResult
 from app.skills.data_analyst.source_registry import SourceRegistry
 
 
@@ -49,11 +49,11 @@ class ComparisonResult:
 
     @property
     def match_count(self) -> int:
-        return sum(1 for r in self.rows if r.status == DiffStatus.MATCH)
+        return sum(1 for r in self.rows if r.status is DiffStatus.MATCH)
 
     @property
     def diff_count(self) -> int:
-        return sum(1 for r in self.rows if r.status != DiffStatus.MATCH)
+        return sum(1 for r in self.rows if r.status is not DiffStatus.MATCH)
 
 
 class ComparisonCache:
@@ -167,13 +167,11 @@ class ComparisonEngine:
         if measure not in source_b.measures:
             raise ValueError(f"Measure '{measure}' not found in {source_b_name}")
 
-        # Query both sources
-        result_a = await self._query_engine.query(
-            source_a, dimensions=align_on, measures=[measure], filters=filters
-        )
-        result_b = await self._query_engine.query(
-            source_b, dimensions=align_on, measures=[measure], filters=filters
-        )
+        # Query both sources in one batch
+        result_a, result_b = await self._query_engine.query_many([
+            QueryRequest(source_a, dimensions=align_on, measures=[measure], filters=filters),
+            QueryRequest(source_b, dimensions=align_on, measures=[measure], filters=filters),
+        ])
 
         # Align and compare
         rows = self._align_and_compare(result_a, result_b, align_on, measure)
@@ -315,13 +313,18 @@ class ComparisonEngine:
         self, rows: list[RowComparison], measure: str
     ) -> dict[str, Any]:
         """Calculate summary statistics for comparison."""
-        total_a = sum(r.source_a_value or 0 for r in rows)
-        total_b = sum(r.source_b_value or 0 for r in rows)
+        # Single pass over rows for both totals and status counts
+        total_a = total_b = 0
+        status_counts = dict.fromkeys(DiffStatus, 0)
+        for r in rows:
+            total_a += r.source_a_value or 0
+            total_b += r.source_b_value or 0
+            status_counts[r.status] += 1
         total_diff = abs(total_a - total_b)
 
-        match_count = sum(1 for r in rows if r.status == DiffStatus.MATCH)
-        minor_count = sum(1 for r in rows if r.status == DiffStatus.MINOR_DIFF)
-        major_count = sum(1 for r in rows if r.status == DiffStatus.MAJOR_DIFF)
+        match_count = status_counts[DiffStatus.MATCH]
+        minor_count = status_counts[DiffStatus.MINOR_DIFF]
+        major_count = status_counts[DiffStatus.MAJOR_DIFF]
 
         return {
             "measure": measure,
@@ -1,15 +1,71 @@
 """SQL query builder and executor for source definitions."""
 
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import AsyncIterator, Sequence
 from dataclasses import dataclass
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from app.connectors.postgres import PostgresConnector
 from app.skills.data_analyst.source_registry import SourceDef
 
+if TYPE_CHECKING:
+    # Only needed for annotations; keeps asyncpg out of skill loading
+    from app.connectors.postgres import PostgresConnector
+
+logger = logging.getLogger(__name__)
+
+# Aggregations that give the same answer when applied to pre-aggregated rows.
+# Aggregate tables store sums only, so MIN/MAX over them would be wrong.
+_REAGGREGATABLE = frozenset({"sum"})
+
+# True when the relation exists and, for a materialized view, is populated and
+# has been refreshed since the last write to its base table. The write and
+# refresh times are kept in aggregate_refresh (see database/init.sql).
+_AGGREGATE_PROBE_SQL = (
+    "SELECT EXISTS (SELECT 1 FROM pg_class c WHERE c.oid = to_regclass($1) "
+    "AND (c.relkind <> 'm' OR (c.relispopulated AND EXISTS ("
+    "SELECT 1 FROM aggregate_refresh r WHERE r.view_name = $1 "
+    "AND r.refreshed_at >= r.base_changed_at)))) AS present"
+)
+
+# Seconds before a source's aggregate tables are probed again, which bounds
+# how long queries keep reading an aggregate that went stale after a load
+_AGGREGATE_PROBE_TTL = 60.0
+
+# Maximum number of distinct query shapes kept in QueryEngine's SQL cache
+_SQL_CACHE_SIZE = 256
+
+
+def _first_unknown(names: Sequence[str], known: frozenset[str]) -> str | None:
+    """Return the first name not in known, or None if all are known.
+
+    The common all-valid case is a single superset check; the ordered scan
+    only runs to report the first offending name.
+    """
+    if known.issuperset(names):
+        return None
+    return next(name for name in names if name not in known)
+
 
 @dataclass
+class QueryRequest:
+    """A single query to run as part of a batch."""
+
+    source: SourceDef
+    dimensions: list[str] | None = None
+    measures: list[str] | None = None
+    filters: dict[str, Any] | None = None
+
+
+@dataclass(slots=True, frozen=True)
 class QueryResult:
-    """Result of a query execution."""
+    """Result of a query execution.
+
+    Immutable so a result can be shared between comparisons and cache
+    entries without copying.
+    """
 
     source_name: str
     rows: list[dict[str, Any]]
@@ -28,6 +84,9 @@ class QueryEngine:
             connector: PostgresConnector instance.
         """
         self._connector = connector
+        self._sql_cache: dict[tuple, str] = {}
+        self._probed_at: dict[str, float] = {}
+        self._unavailable_tables: set[str] = set()
 
     async def query(
         self,
@@ -47,19 +106,8 @@ class QueryEngine:
         Returns:
             QueryResult with aggregated data.
         """
-        # Use defaults if not specified
-        if dimensions is None:
-            dimensions = source.defaults.get("dimensions", [])
-        if measures is None:
-            measures = list(source.measures.keys())
-
-        # Validate dimensions and measures exist
-        for dim in dimensions:
-            if dim not in source.dimensions:
-                raise ValueError(f"Unknown dimension: {dim}")
-        for measure in measures:
-            if measure not in source.measures:
-                raise ValueError(f"Unknown measure: {measure}")
+        dimensions, measures = self._resolve_fields(source, dimensions, measures)
+        await self._probe_aggregates(source)
 
         # Build query
         sql, params = self._build_query(source, dimensions, measures, filters)
@@ -75,6 +123,141 @@ class QueryEngine:
             row_count=len(rows),
         )
 
+    async def stream(
+        self,
+        source: SourceDef,
+        dimensions: list[str] | None = None,
+        measures: list[str] | None = None,
+        filters: dict[str, Any] | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Execute a query and yield result rows without collecting them.
+
+        For callers that read the rows once, such as exports over large
+        sources. Arguments are the same as for query().
+
+        Yields:
+            Aggregated rows as dictionaries.
+        """
+        dimensions, measures = self._resolve_fields(source, dimensions, measures)
+        await self._probe_aggregates(source)
+        sql, params = self._build_query(source, dimensions, measures, filters)
+
+        async for row in self._connector.stream(sql, params):
+            yield row
+
+    async def query_many(self, requests: list[QueryRequest]) -> list[QueryResult]:
+        """Execute several queries in one connector round.
+
+        All queries run on the same connection, which saves a pool checkout
+        per query and gives every result the same snapshot.
+
+        Args:
+            requests: Queries to execute.
+
+        Returns:
+            QueryResults in the same order as requests.
+        """
+        resolved = []
+        statements = []
+        for request in requests:
+            dimensions, measures = self._resolve_fields(
+                request.source, request.dimensions, request.measures
+            )
+            resolved.append((request.source, dimensions, measures))
+            await self._probe_aggregates(request.source)
+            statements.append(
+                self._build_query(request.source, dimensions, measures, request.filters)
+            )
+
+        rows_per_query = await self._connector.execute_many(statements)
+
+        return [
+            QueryResult(
+                source_name=source.name,
+                rows=rows,
+                dimensions_used=dimensions,
+                measures_used=measures,
+                row_count=len(rows),
+            )
+            for (source, dimensions, measures), rows in zip(
+                resolved, rows_per_query, strict=True
+            )
+        ]
+
+    async def _probe_aggregates(self, source: SourceDef) -> None:
+        """Check that a source's aggregate tables can be read and are current.
+
+        Runs at most once per _AGGREGATE_PROBE_TTL seconds per source.
+        Aggregates that do not exist, are unpopulated or stale materialized
+        views, or cannot be probed are skipped so queries fall back to the
+        base table.
+        """
+        if not source.aggregates:
+            return
+        now = time.monotonic()
+        probed_at = self._probed_at.get(source.name)
+        if probed_at is not None and now - probed_at < _AGGREGATE_PROBE_TTL:
+            return
+
+        unavailable = set()
+        for aggregate in source.aggregates:
+            try:
+                rows = await self._connector.execute(_AGGREGATE_PROBE_SQL, [aggregate.table])
+            except Exception:
+                logger.warning(
+                    "Could not probe aggregate table %s for source %s; using %s",
+                    aggregate.table,
+                    source.name,
+                    source.table,
+                    exc_info=True,
+                )
+                rows = None
+            if not (rows and rows[0]["present"]):
+                if aggregate.table not in self._unavailable_tables:
+                    logger.warning(
+                        "Aggregate table %s for source %s is missing, unpopulated "
+                        "or stale; using %s",
+                        aggregate.table,
+                        source.name,
+                        source.table,
+                    )
+                unavailable.add(aggregate.table)
+
+        tables = {aggregate.table for aggregate in source.aggregates}
+        current = self._unavailable_tables & tables
+        if unavailable != current:
+            self._unavailable_tables = (self._unavailable_tables - tables) | unavailable
+            # Cached SQL may name a table whose availability just changed
+            self._sql_cache.clear()
+        self._probed_at[source.name] = now
+
+    def _resolve_fields(
+        self,
+        source: SourceDef,
+        dimensions: list[str] | None,
+        measures: list[str] | None,
+    ) -> tuple[list[str], list[str]]:
+        """Apply source defaults and validate dimensions and measures.
+
+        Raises:
+            ValueError: If a dimension or measure is unknown.
+        """
+        # Use defaults if not specified
+        if dimensions is None:
+            dimensions = source.defaults.get("dimensions", [])
+        if measures is None:
+            measures = list(source.measures.keys())
+
+        # Validate dimensions and measures exist
+        unknown = _first_unknown(dimensions, source.dimension_names)
+        if unknown is not None:
+            raise ValueError(f"Unknown dimension: {unknown}")
+        unknown = _first_unknown(measures, source.measure_names)
+        if unknown is not None:
+            raise ValueError(f"Unknown measure: {unknown}")
+
+        return dimensions, measures
+
     def _build_query(
         self,
         source: SourceDef,
@@ -84,50 +267,90 @@ class QueryEngine:
     ) -> tuple[str, list[Any]]:
         """Build SQL query string and parameters.
 
+        The SQL text only depends on the query shape, so it is cached per
+        (source, dimensions, measures, filter dimensions) and only the
+        parameter list is rebuilt on each call.
+
+        A list or tuple filter value becomes ``col = ANY($n)`` with the whole
+        list bound as one array parameter, so the statement text does not
+        change with the number of values.
+
         Args:
             source: Source definition.
             dimensions: Dimensions to group by.
             measures: Measures to aggregate.
-            filters: Filter conditions.
+            filters: Filter conditions, as {dimension: value or list of values}.
 
         Returns:
             Tuple of (sql_string, parameters_list).
         """
+        filter_shape = (
+            tuple((dim, isinstance(value, list | tuple)) for dim, value in filters.items())
+            if filters
+            else ()
+        )
+        key = (source.name, tuple(dimensions), tuple(measures), filter_shape)
+
+        sql = self._sql_cache.get(key)
+        if sql is None:
+            sql = self._build_sql(source, dimensions, measures, filter_shape)
+            if len(self._sql_cache) >= _SQL_CACHE_SIZE:
+                self._sql_cache.clear()
+            self._sql_cache[key] = sql
+
+        params = [
+            list(filters[dim]) if is_list else filters[dim] for dim, is_list in filter_shape
+        ]
+        return sql, params
+
+    def _build_sql(
+        self,
+        source: SourceDef,
+        dimensions: list[str],
+        measures: list[str],
+        filter_shape: tuple[tuple[str, bool], ...],
+    ) -> str:
+        """Build the SQL text for a query shape.
+
+        filter_shape holds (dimension, is_list) pairs; placeholders are
+        numbered in that order.
+        """
+        filter_dims = tuple(dim for dim, _ in filter_shape)
+
         # SELECT clause
         select_parts = []
         for dim in dimensions:
-            col = source.dimensions[dim].column
+            col = source.dimensions[dim].quoted_column
             select_parts.append(f"{col} AS {dim}")
 
         for measure in measures:
             measure_def = source.measures[measure]
             agg = measure_def.aggregation.upper()
-            col = measure_def.column
+            col = measure_def.quoted_column
             select_parts.append(f"{agg}({col}) AS {measure}")
 
         select_clause = ", ".join(select_parts)
 
         # FROM clause
-        from_clause = source.table
+        from_clause = self._select_table(source, dimensions, measures, filter_dims)
 
         # WHERE clause
+        unknown = _first_unknown(filter_dims, source.dimension_names)
+        if unknown is not None:
+            raise ValueError(f"Unknown filter dimension: {unknown}")
+
         where_parts = []
-        params = []
-        param_idx = 1
-
-        if filters:
-            for dim, value in filters.items():
-                if dim not in source.dimensions:
-                    raise ValueError(f"Unknown filter dimension: {dim}")
-                col = source.dimensions[dim].column
+        for param_idx, (dim, is_list) in enumerate(filter_shape, start=1):
+            col = source.dimensions[dim].quoted_column
+            if is_list:
+                where_parts.append(f"{col} = ANY(${param_idx})")
+            else:
                 where_parts.append(f"{col} = ${param_idx}")
-                params.append(value)
-                param_idx += 1
 
         where_clause = f"WHERE {' AND '.join(where_parts)}" if where_parts else ""
 
         # GROUP BY clause
-        group_parts = [source.dimensions[dim].column for dim in dimensions]
+        group_parts = [source.dimensions[dim].quoted_column for dim in dimensions]
         group_clause = f"GROUP BY {', '.join(group_parts)}" if group_parts else ""
 
         # Assemble query
@@ -137,4 +360,29 @@ class QueryEngine:
         if group_clause:
             sql = f"{sql} {group_clause}"
 
-        return sql, params
+        return sql
+
+    def _select_table(
+        self,
+        source: SourceDef,
+        dimensions: list[str],
+        measures: list[str],
+        filter_dims: tuple[str, ...],
+    ) -> str:
+        """Pick the table to read from.
+
+        Uses the first available pre-aggregated table covering every grouped
+        and filtered dimension, provided all measures are sums. Aggregates
+        are tried in config order, so list the smallest first.
+        """
+        if source.aggregates and all(
+            source.measures[m].aggregation.lower() in _REAGGREGATABLE for m in measures
+        ):
+            needed = set(dimensions).union(filter_dims)
+            for aggregate in source.aggregates:
+                if aggregate.table in self._unavailable_tables:
+                    continue
+                if needed.issubset(aggregate.dimensions):
+                    return aggregate.table
+        return source.table
+
@@ -1,26 +1,73 @@
 """Source registry - loads and manages data source definitions from YAML."""
 
+import re
+import sys
+from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
-from typing import Any
+from typing import Any, Self
 
 import yaml
 from pydantic import BaseModel, Field
 
+# Prefer the libyaml-backed loader; PyYAML builds without libyaml lack it
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
-class DimensionDef(BaseModel):
+# Identifiers PostgreSQL reads the same whether quoted or not
+_PLAIN_IDENTIFIER = re.compile(r"[a-z_][a-z0-9_]*")
+
+
+def quote_identifier(name: str) -> str:
+    """Quote a column name for use in SQL, like PostgreSQL's quote_ident.
+
+    Plain lowercase names are returned unchanged; anything else (mixed case,
+    spaces, quotes) is wrapped in double quotes with embedded quotes doubled.
+    """
+    if _PLAIN_IDENTIFIER.fullmatch(name):
+        return name
+    return '"' + name.replace('"', '""') + '"'
+
+
+@dataclass(slots=True, frozen=True)
+class DimensionDef:
     """Definition of a dimension in a source."""
 
     column: str
     type: str = "string"
     format: str | None = None
-    values: list[str] | None = None
+    values: tuple[str, ...] | None = None
+    # Column name ready to splice into SQL, quoted once at load time
+    quoted_column: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "quoted_column", quote_identifier(self.column))
 
 
-class MeasureDef(BaseModel):
+@dataclass(slots=True, frozen=True)
+class MeasureDef:
     """Definition of a measure in a source."""
 
     column: str
     aggregation: str = "sum"
+    # Column name ready to splice into SQL, quoted once at load time
+    quoted_column: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "quoted_column", quote_identifier(self.column))
+
+
+class AggregateDef(BaseModel):
+    """Pre-aggregated table that can answer queries over a dimension subset.
+
+    The table must expose the same dimension and measure columns as the
+    base table, with measures already summed over `dimensions`. Only sum
+    measures are routed to it. A materialized view is only used while it is
+    current according to the aggregate_refresh table, so refresh it with
+    refresh_aggregate() after every load into the base table.
+    """
+
+    table: str
+    dimensions: list[str]
 
 
 class SourceDef(BaseModel):
@@ -32,9 +79,29 @@ class SourceDef(BaseModel):
     dimensions: dict[str, DimensionDef]
     measures: dict[str, MeasureDef]
     defaults: dict[str, Any] = Field(default_factory=dict)
+    aggregates: list[AggregateDef] = Field(default_factory=list)
+
+    @cached_property
+    def dimension_names(self) -> frozenset[str]:
+        """Names of all dimensions, for membership checks."""
+        return frozenset(self.dimensions)
+
+    @cached_property
+    def measure_names(self) -> frozenset[str]:
+        """Names of all measures, for membership checks."""
+        return frozenset(self.measures)
+
+    def model_copy(self, *, update: dict[str, Any] | None = None, deep: bool = False) -> Self:
+        """Copy the source, dropping name sets cached from the original's fields."""
+        copy = super().model_copy(update=update, deep=deep)
+        # cached_property values live in __dict__, which the copy inherits
+        copy.__dict__.pop("dimension_names", None)
+        copy.__dict__.pop("measure_names", None)
+        return copy
 
 
-class ComparisonThreshold(BaseModel):
+@dataclass(slots=True, frozen=True)
+class ComparisonThreshold:
     """Threshold for comparison matching."""
 
     absolute: float
@@ -53,12 +120,56 @@ class SourceNotFoundError(Exception):
     """Raised when a source is not found."""
 
 
+def _dimension_def(value: dict[str, Any] | str) -> DimensionDef:
+    """Build a DimensionDef from a config entry or a bare column name."""
+    if not isinstance(value, dict):
+        return DimensionDef(column=value)
+    values = value.get("values")
+    return DimensionDef(
+        column=value["column"],
+        type=value.get("type", "string"),
+        format=value.get("format"),
+        values=tuple(values) if values is not None else None,
+    )
+
+
+def _measure_def(value: dict[str, Any] | str) -> MeasureDef:
+    """Build a MeasureDef from a config entry or a bare column name."""
+    if not isinstance(value, dict):
+        return MeasureDef(column=value)
+    return MeasureDef(column=value["column"], aggregation=value.get("aggregation", "sum"))
+
+
+def _check_config(config: dict[str, Any]) -> None:
+    """Check the keys the source models require, once per config file.
+
+    Raises:
+        ValueError: If a required key is missing.
+    """
+    for name, source_data in config.get("sources", {}).items():
+        for kind in ("dimensions", "measures"):
+            for key, value in source_data.get(kind, {}).items():
+                if isinstance(value, dict) and "column" not in value:
+                    raise ValueError(f"Source '{name}' {kind[:-1]} '{key}' has no column")
+        for aggregate in source_data.get("aggregates", []):
+            if "table" not in aggregate or "dimensions" not in aggregate:
+                raise ValueError(f"Source '{name}' aggregate needs table and dimensions")
+
+    comparison = config.get("comparison") or {}
+    for key, threshold in comparison.get("thresholds", {}).items():
+        if "absolute" not in threshold or "percentage" not in threshold:
+            raise ValueError(f"Comparison threshold '{key}' needs absolute and percentage")
+
+
 class SourceRegistry:
     """Registry of available data sources loaded from YAML config."""
 
     def __init__(self, config_path: Path | str = "config/sources.yaml"):
         self._sources: dict[str, SourceDef] = {}
         self._comparison_config: ComparisonConfig | None = None
+        self._common_dims_cache: dict[tuple[str, str], tuple[str, ...]] = {}
+        self._source_info: list[dict[str, Any]] | None = None
+        self._comparison_pairs: list[dict[str, Any]] | None = None
         self._load_config(Path(config_path))
 
     def _load_config(self, config_path: Path) -> None:
@@ -66,36 +177,44 @@ class SourceRegistry:
         if not config_path.exists():
             raise FileNotFoundError(f"Config file not found: {config_path}")
 
-        with open(config_path) as f:
-            config = yaml.safe_load(f)
+        with open(config_path, "rb") as f:
+            config = yaml.load(f, Loader=_SafeLoader)
 
-        # Load sources
+        _check_config(config)
+
+        # The structure was checked above, so definitions are built without
+        # running pydantic validation per entry.
+        # Names are interned since they are used as dict keys on every query.
         for name, source_data in config.get("sources", {}).items():
+            name = sys.intern(name)
             dimensions = {
-                k: DimensionDef(**v) if isinstance(v, dict) else DimensionDef(column=v)
+                sys.intern(k): _dimension_def(v)
                 for k, v in source_data.get("dimensions", {}).items()
             }
             measures = {
-                k: MeasureDef(**v) if isinstance(v, dict) else MeasureDef(column=v)
+                sys.intern(k): _measure_def(v)
                 for k, v in source_data.get("measures", {}).items()
             }
-            self._sources[name] = SourceDef(
+            self._sources[name] = SourceDef.model_construct(
                 name=name,
                 description=source_data.get("description", ""),
                 table=source_data.get("table", name),
                 dimensions=dimensions,
                 measures=measures,
                 defaults=source_data.get("defaults", {}),
+                aggregates=[
+                    AggregateDef.model_construct(**a) for a in source_data.get("aggregates", [])
+                ],
             )
 
         # Load comparison config
         comp_config = config.get("comparison", {})
         if comp_config:
             thresholds = {
-                k: ComparisonThreshold(**v)
+                k: ComparisonThreshold(absolute=v["absolute"], percentage=v["percentage"])
                 for k, v in comp_config.get("thresholds", {}).items()
             }
-            self._comparison_config = ComparisonConfig(
+            self._comparison_config = ComparisonConfig.model_construct(
                 default_align_on=comp_config.get("default_align_on", ["company", "period"]),
                 thresholds=thresholds,
                 cache_ttl_seconds=comp_config.get("cache_ttl_seconds", 3600),
@@ -107,31 +226,77 @@ class SourceRegistry:
         Raises:
             SourceNotFoundError: If source doesn't exist.
         """
-        if name not in self._sources:
+        source = self._sources.get(name)
+        if source is None:
             raise SourceNotFoundError(f"Source '{name}' not found")
-        return self._sources[name]
+        return source
 
     def list_sources(self) -> list[str]:
         """List all source names."""
         return list(self._sources.keys())
 
     def get_source_info(self) -> list[dict[str, Any]]:
-        """Get info about all sources for LLM context."""
-        return [
-            {
-                "name": s.name,
-                "description": s.description,
-                "dimensions": list(s.dimensions.keys()),
-                "measures": list(s.measures.keys()),
-            }
-            for s in self._sources.values()
-        ]
+        """Get info about all sources for LLM context.
+
+        Built on first use and shared afterwards, so callers must treat it
+        as read-only; field names are tuples to discourage changes.
+        """
+        if self._source_info is None:
+            self._source_info = [
+                {
+                    "name": s.name,
+                    "description": s.description,
+                    "dimensions": tuple(s.dimensions),
+                    "measures": tuple(s.measures),
+                }
+                for s in self._sources.values()
+            ]
+        return self._source_info
 
     def get_common_dimensions(self, source1: str, source2: str) -> list[str]:
-        """Get dimensions that exist in both sources."""
-        s1 = self.get(source1)
-        s2 = self.get(source2)
-        return list(set(s1.dimensions.keys()) & set(s2.dimensions.keys()))
+        """Get dimensions that exist in both sources.
+
+        Sources do not change after loading, so the result is cached per
+        unordered pair. Names are listed in the order of the source with
+        fewer dimensions.
+        """
+        key = (source1, source2) if source1 <= source2 else (source2, source1)
+        common = self._common_dims_cache.get(key)
+        if common is None:
+            s1 = self.get(key[0])
+            s2 = self.get(key[1])
+            if s1 is s2:
+                common = tuple(s1.dimensions)
+            elif not s1.dimensions or not s2.dimensions:
+                common = ()
+            else:
+                # Walk the smaller source and probe the other's name set
+                if len(s2.dimensions) < len(s1.dimensions):
+                    s1, s2 = s2, s1
+                common = tuple(dim for dim in s1.dimensions if dim in s2.dimension_names)
+            self._common_dims_cache[key] = common
+        return list(common)
+
+    def get_comparison_pairs(self) -> list[dict[str, Any]]:
+        """Get every pair of sources that share at least one dimension.
+
+        Built on first use and shared afterwards, so callers must treat it
+        as read-only.
+        """
+        if self._comparison_pairs is None:
+            names = list(self._sources)
+            pairs = []
+            for i, name_a in enumerate(names):
+                for name_b in names[i + 1:]:
+                    common = self.get_common_dimensions(name_a, name_b)
+                    if common:
+                        pairs.append({
+                            "source_a": name_a,
+                            "source_b": name_b,
+                            "common_dimensions": common,
+                        })
+            self._comparison_pairs = pairs
+        return self._comparison_pairs
 
     @property
     def comparison_config(self) -> ComparisonConfig | None:
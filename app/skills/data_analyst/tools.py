@@ -5,21 +5,30 @@ following Anthropic best practices: consolidated functionality,
 clear documentation-style descriptions, and meaningful responses.
 """
 
+import bisect
+import heapq
+import threading
+from collections import OrderedDict
+from operator import attrgetter
 from pathlib import Path
 from typing import Any
 
-from app.skills.data_analyst.comparison_engine import ComparisonEngine, ComparisonResult
+from app.skills.data_analyst.comparison_engine import (
+    ComparisonEngine,
+    ComparisonResult,
+    DiffStatus,
+)
 from app.skills.data_analyst.query_engine import QueryEngine
 from app.skills.data_analyst.source_registry import SourceRegistry
 
 
 def _format_comparison_result(result: ComparisonResult) -> dict[str, Any]:
     """Format comparison result for LLM-friendly output."""
-    major_diffs = [r for r in result.rows if r.status.value == "major_diff"]
-    minor_diffs = [r for r in result.rows if r.status.value == "minor_diff"]
+    # Every non-matching row is a major or minor difference
+    diff_rows = (r for r in result.rows if r.status is not DiffStatus.MATCH)
 
     top_diffs = []
-    for row in sorted(major_diffs + minor_diffs, key=lambda r: r.absolute_diff, reverse=True)[:5]:
+    for row in heapq.nlargest(5, diff_rows, key=attrgetter("absolute_diff")):
         top_diffs.append({
             "key": row.key,
             "source_a": row.source_a_value,
@@ -49,37 +58,62 @@ def _format_comparison_result(result: ComparisonResult) -> dict[str, Any]:
     }
 
 
+# Lower bounds (match %) of the moderate, good and perfect alignment bands
+_ALIGNMENT_THRESHOLDS = (50, 90, 100)
+_ALIGNMENT_LABELS = ("poor", "moderate", "good", "perfect")
+
+
+# Interpretation text per alignment band
+_INTERPRETATIONS = {
+    "perfect": "All {total} rows match perfectly between {source_a} and {source_b}.",
+    "good": "Good alignment ({pct:.1f}% match). {major} rows have major differences.",
+    "moderate": (
+        "Moderate alignment ({pct:.1f}% match). "
+        "{major} rows have major differences requiring investigation."
+    ),
+    "poor": (
+        "Poor alignment ({pct:.1f}% match). "
+        "Significant discrepancies between sources. Review data quality."
+    ),
+}
+
+
+def _classify_alignment(match_pct: float) -> str:
+    """Map a match percentage to its alignment band."""
+    return _ALIGNMENT_LABELS[bisect.bisect_right(_ALIGNMENT_THRESHOLDS, match_pct)]
+
+
 def _generate_interpretation(result: ComparisonResult) -> str:
-    """Generate human-readable interpretation of comparison."""
+    """Generate human-readable interpretation of comparison.
+
+    Uses the status counts ComparisonEngine already put in the summary
+    rather than scanning the rows again.
+    """
     total = result.total_rows
-    match_pct = (result.match_count / total * 100) if total > 0 else 0
+    match_count = result.summary.get("match_count", 0)
+    match_pct = (match_count / total * 100) if total > 0 else 0
     major_count = result.summary.get("major_diff_count", 0)
 
-    if match_pct == 100:
-        return (
-            f"All {total} rows match perfectly between "
-            f"{result.source_a} and {result.source_b}."
-        )
-    elif match_pct >= 90:
-        return (
-            f"Good alignment ({match_pct:.1f}% match). "
-            f"{major_count} rows have major differences."
-        )
-    elif match_pct >= 50:
-        return (
-            f"Moderate alignment ({match_pct:.1f}% match). "
-            f"{major_count} rows have major differences requiring investigation."
-        )
-    else:
-        return (
-            f"Poor alignment ({match_pct:.1f}% match). "
-            "Significant discrepancies between sources. Review data quality."
-        )
+    return _INTERPRETATIONS[_classify_alignment(match_pct)].format(
+        total=total,
+        pct=match_pct,
+        major=major_count,
+        source_a=result.source_a,
+        source_b=result.source_b,
+    )
+
 
+# DataAnalystTools per connector, keyed by id(connector) since connectors
+# need not be hashable. Each entry stores its connector too and is only used
+# for that same object, in least recently used order.
+_tools_cache: "OrderedDict[int, tuple[Any, DataAnalystTools]]" = OrderedDict()
+_tools_lock = threading.Lock()
 
-# Module-level tools instance cache
-_tools_instance: "DataAnalystTools | None" = None
-_tools_connector: Any = None
+# Connectors are long-lived, so only a handful of entries are expected
+_TOOLS_CACHE_SIZE = 8
+
+# Source registries by config path, with the file mtime they were loaded at
+_registry_cache: dict[Path, tuple[float, SourceRegistry]] = {}
 
 
 class DataAnalystTools:
@@ -94,33 +128,22 @@ class DataAnalystTools:
         self._registry = registry
         self._query_engine = query_engine
         self._comparison_engine = comparison_engine
+        self._list_sources_response: dict[str, Any] | None = None
 
     def list_sources(self) -> dict[str, Any]:
-        """List all available data sources with their descriptions and fields."""
-        sources_info = self._registry.get_source_info()
-
-        return {
-            "sources": sources_info,
-            "total_count": len(sources_info),
-            "available_comparisons": self._get_comparison_pairs(sources_info),
-        }
-
-    def _get_comparison_pairs(self, sources: list[dict]) -> list[dict]:
-        """Generate valid comparison pairs based on common dimensions."""
-        pairs = []
-        source_names = [s["name"] for s in sources]
-
-        for i, name_a in enumerate(source_names):
-            for name_b in source_names[i + 1:]:
-                common = self._registry.get_common_dimensions(name_a, name_b)
-                if common:
-                    pairs.append({
-                        "source_a": name_a,
-                        "source_b": name_b,
-                        "common_dimensions": common,
-                    })
-
-        return pairs
+        """List all available data sources with their descriptions and fields.
+
+        The registry does not change after loading, so the response is built
+        once and shared; callers must not modify it.
+        """
+        if self._list_sources_response is None:
+            sources_info = self._registry.get_source_info()
+            self._list_sources_response = {
+                "sources": sources_info,
+                "total_count": len(sources_info),
+                "available_comparisons": self._registry.get_comparison_pairs(),
+            }
+        return self._list_sources_response
 
     async def query_source(
         self,
@@ -167,19 +190,42 @@ class DataAnalystTools:
         return _format_comparison_result(result)
 
 
+def _get_source_registry(config_path: Path) -> SourceRegistry:
+    """Get the SourceRegistry for a config file, reloading it only if it changed."""
+    mtime = config_path.stat().st_mtime
+    cached = _registry_cache.get(config_path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    registry = SourceRegistry(config_path)
+    _registry_cache[config_path] = (mtime, registry)
+    return registry
+
+
 def _get_tools_instance(connector: Any) -> DataAnalystTools:
-    """Get or create the DataAnalystTools singleton."""
-    global _tools_instance, _tools_connector
+    """Get or create the DataAnalystTools instance for a connector.
+
+    Each connector keeps its own instance, so alternating connectors do not
+    rebuild engines. The source registry does not depend on the connector
+    and is shared; instances are rebuilt only when the config file changes.
+    """
+    registry = _get_source_registry(Path("config/sources.yaml"))
+    key = id(connector)
+
+    with _tools_lock:
+        entry = _tools_cache.get(key)
+        if entry is not None and entry[0] is connector and entry[1]._registry is registry:
+            _tools_cache.move_to_end(key)
+            return entry[1]
 
-    if _tools_instance is None or _tools_connector is not connector:
-        config_path = Path("config/sources.yaml")
-        registry = SourceRegistry(config_path)
         query_engine = QueryEngine(connector)
         comparison_engine = ComparisonEngine(registry, query_engine)
-        _tools_instance = DataAnalystTools(registry, query_engine, comparison_engine)
-        _tools_connector = connector
-
-    return _tools_instance
+        tools = DataAnalystTools(registry, query_engine, comparison_engine)
+        _tools_cache.pop(key, None)
+        while len(_tools_cache) >= _TOOLS_CACHE_SIZE:
+            _tools_cache.popitem(last=False)
+        _tools_cache[key] = (connector, tools)
+        return tools
 
 
 # Standalone tool functions for YAML loader
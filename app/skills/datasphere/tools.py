@@ -1,5 +1,13 @@
 """Tool implementations for Datasphere skill."""
 
+import asyncio
+import copy
+import heapq
+import re
+import time
+from collections import OrderedDict
+from operator import itemgetter
+from types import MappingProxyType
 from typing import Any
 
 from app.connectors.datasphere import DatasphereConnector, DatasphereQueryError
@@ -8,6 +16,126 @@ from app.connectors.datasphere import DatasphereConnector, DatasphereQueryError
 # Module-level connector cache
 _connector: DatasphereConnector | None = None
 
+# Seconds a backend payload may be reused by an identical tool call
+_QUERY_TTL = 60
+_LIST_TTL = 60
+_METADATA_TTL = 300
+
+# Maximum number of backend payloads kept by the result cache
+_CACHE_MAXSIZE = 256
+
+# Maximum rows returned from execute_sql
+_SQL_ROW_LIMIT = 500
+
+# Leading SELECT keyword, matched in place without copying the query
+_SELECT_PREFIX = re.compile(r"\s*select", re.IGNORECASE)
+
+# Statuses with which a service may reject $apply; other errors (auth,
+# throttling, outages) would fail the plain query just the same
+_APPLY_REJECTED = frozenset({400, 404, 405, 422, 501})
+
+# Statuses that mean the service cannot do $apply at all. A 400 or 422 is
+# usually a bad measure or filter_expr, so it only counts when it names $apply.
+_APPLY_UNSUPPORTED = frozenset({405, 501})
+
+# (space, entity) pairs whose service cannot do $apply; compared client-side
+_apply_unsupported: set[tuple[str, str]] = set()
+
+# Suffix of the $apply aggregate alias; OData forbids aliasing to a
+# declared property, so the summed measure cannot keep its own name
+_APPLY_ALIAS_SUFFIX = "_total"
+
+# Field accessors for comparison records
+_get_value_a = itemgetter("value_a")
+_get_value_b = itemgetter("value_b")
+_get_difference_pct = itemgetter("difference_pct")
+
+
+class _ResultCache:
+    """Bounded TTL cache for backend payloads, keyed by normalized arguments.
+
+    Keys are tuples of (kind, space, entity, ...), so entries for one entity
+    can be dropped with invalidate(). Once maxsize entries are held, expired
+    entries are swept and then the least recently used ones evicted. Payloads
+    are stored as read-only snapshots and each hit returns a fresh plain copy,
+    so callers can never modify a cached value.
+    """
+
+    def __init__(self, maxsize: int = _CACHE_MAXSIZE) -> None:
+        self._maxsize = maxsize
+        self._cache: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: tuple) -> Any | None:
+        """Get a plain copy of a cached payload if not expired."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._cache[key]
+            return None
+
+        self._cache.move_to_end(key)
+        return _thaw(value)
+
+    def set(self, key: tuple, value: Any, ttl: float) -> None:
+        """Store a read-only snapshot of a payload for ttl seconds."""
+        now = time.monotonic()
+        self._cache.pop(key, None)
+        if len(self._cache) >= self._maxsize:
+            for stale in [k for k, (expires_at, _) in self._cache.items() if expires_at <= now]:
+                del self._cache[stale]
+            while len(self._cache) >= self._maxsize:
+                self._cache.popitem(last=False)
+        self._cache[key] = (now + ttl, _freeze(value))
+
+    def invalidate(self, entity: str) -> None:
+        """Drop every cached payload for an entity."""
+        for key in [k for k in self._cache if len(k) > 2 and k[2] == entity]:
+            del self._cache[key]
+
+    def clear(self) -> None:
+        """Clear all cached entries."""
+        self._cache.clear()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+def _freeze(value: Any) -> Any:
+    """Snapshot a payload for the cache.
+
+    Row lists become tuples of read-only row mappings, copied once here.
+    Row values are scalars in OData and SQL results and are not copied.
+    Other payloads (metadata) are small and rarely read, so they are
+    deep-copied.
+    """
+    if isinstance(value, list):
+        return tuple(
+            MappingProxyType(dict(item)) if isinstance(item, dict) else item for item in value
+        )
+    return copy.deepcopy(value)
+
+
+def _thaw(value: Any) -> Any:
+    """Rebuild a plain payload from a _freeze() snapshot."""
+    if isinstance(value, tuple):
+        return [item.copy() if isinstance(item, MappingProxyType) else item for item in value]
+    return copy.deepcopy(value)
+
+
+_result_cache = _ResultCache()
+
+
+def invalidate(entity: str | None = None) -> None:
+    """Forget cached results for an entity, or for everything."""
+    if entity is None:
+        _result_cache.clear()
+        _apply_unsupported.clear()
+    else:
+        _result_cache.invalidate(entity)
+
 
 def _get_connector(connector: Any) -> DatasphereConnector:
     """Get or cache the Datasphere connector."""
@@ -25,8 +153,12 @@ def _get_connector(connector: Any) -> DatasphereConnector:
 async def list_entities(connector: Any = None) -> dict[str, Any]:
     """List all available entities in the Datasphere space."""
     conn = _get_connector(connector)
+    key = ("list", conn.space)
     try:
-        entities = await conn.list_entities()
+        entities = _result_cache.get(key)
+        if entities is None:
+            entities = await conn.list_entities()
+            _result_cache.set(key, entities, _LIST_TTL)
         return {
             "entities": entities,
             "count": len(entities),
@@ -46,14 +178,26 @@ async def query_entity(
 ) -> dict[str, Any]:
     """Query a Datasphere entity using OData."""
     conn = _get_connector(connector)
+    key = (
+        "query",
+        conn.space,
+        entity,
+        tuple(sorted(select or ())),
+        " ".join((filter_expr or "").split()),
+        top,
+        orderby,
+    )
     try:
-        results = await conn.execute_odata(
-            entity=entity,
-            select=select,
-            filter_expr=filter_expr,
-            top=top,
-            orderby=orderby,
-        )
+        results = _result_cache.get(key)
+        if results is None:
+            results = await conn.execute_odata(
+                entity=entity,
+                select=select,
+                filter_expr=filter_expr,
+                top=top,
+                orderby=orderby,
+            )
+            _result_cache.set(key, results, _QUERY_TTL)
 
         return {
             "entity": entity,
@@ -72,12 +216,16 @@ async def query_entity(
 
 
 async def execute_sql(query: str, connector: Any = None) -> dict[str, Any]:
-    """Execute a SQL query against Datasphere."""
+    """Execute a SQL query against Datasphere.
+
+    At most _SQL_ROW_LIMIT rows are returned. One extra row is requested to
+    detect truncation, so row_count is capped at _SQL_ROW_LIMIT + 1 and
+    truncated is set when rows were dropped.
+    """
     conn = _get_connector(connector)
 
     # Basic safety check - only allow SELECT
-    query_upper = query.strip().upper()
-    if not query_upper.startswith("SELECT"):
+    if not _SELECT_PREFIX.match(query):
         return {
             "error": "Only SELECT queries are allowed for safety",
             "query": query,
@@ -85,12 +233,15 @@ async def execute_sql(query: str, connector: Any = None) -> dict[str, Any]:
         }
 
     try:
-        results = await conn.execute_sql(query)
+        # One row past the limit tells us whether anything was cut off
+        results = await conn.execute_sql(query, max_rows=_SQL_ROW_LIMIT + 1)
+        truncated = len(results) > _SQL_ROW_LIMIT
         return {
             "query": query,
             "row_count": len(results),
-            "rows": results[:500],
-            "truncated": len(results) > 500,
+            # Only copy when rows are dropped; the full list is not kept
+            "rows": results[:_SQL_ROW_LIMIT] if truncated else results,
+            "truncated": truncated,
         }
     except DatasphereQueryError as e:
         return {
@@ -103,8 +254,12 @@ async def execute_sql(query: str, connector: Any = None) -> dict[str, Any]:
 async def get_entity_metadata(entity: str, connector: Any = None) -> dict[str, Any]:
     """Get metadata for a specific entity."""
     conn = _get_connector(connector)
+    key = ("meta", conn.space, entity)
     try:
-        metadata = await conn.get_metadata(entity)
+        metadata = _result_cache.get(key)
+        if metadata is None:
+            metadata = await conn.get_metadata(entity)
+            _result_cache.set(key, metadata, _METADATA_TTL)
         return {
             "entity": entity,
             "metadata": metadata,
@@ -127,24 +282,14 @@ async def compare_entities(
 ) -> dict[str, Any]:
     """Compare a measure between two entities."""
     conn = _get_connector(connector)
+    apply = _aggregation_apply(measure, group_by, filter_expr)
+    # Same ordering on both sides lets _build_comparison pair rows directly
+    orderby = ",".join(group_by) if group_by else None
     try:
-        # Query both entities
-        select_fields = [measure]
-        if group_by:
-            select_fields = group_by + [measure]
-
-        results_a = await conn.execute_odata(
-            entity=entity_a,
-            select=select_fields,
-            filter_expr=filter_expr,
-            top=1000,
-        )
-
-        results_b = await conn.execute_odata(
-            entity=entity_b,
-            select=select_fields,
-            filter_expr=filter_expr,
-            top=1000,
+        # The two queries are independent, so overlap their round trips
+        results_a, results_b = await asyncio.gather(
+            _fetch_group_totals(conn, entity_a, measure, group_by, filter_expr, apply, orderby),
+            _fetch_group_totals(conn, entity_b, measure, group_by, filter_expr, apply, orderby),
         )
 
         # Build comparison
@@ -156,7 +301,7 @@ async def compare_entities(
             "measure": measure,
             "group_by": group_by,
             "comparison": comparison,
-            "summary": _summarize_comparison(comparison, measure),
+            "summary": _summarize_comparison(comparison),
         }
     except DatasphereQueryError as e:
         return {
@@ -166,6 +311,86 @@ async def compare_entities(
         }
 
 
+async def _fetch_group_totals(
+    conn: DatasphereConnector,
+    entity: str,
+    measure: str,
+    group_by: list[str] | None,
+    filter_expr: str | None,
+    apply: str,
+    orderby: str | None,
+) -> list[dict]:
+    """Fetch the measure summed per group for one entity.
+
+    Aggregates on the server with $apply. If the service rejects the
+    request, raw rows are fetched and summed here instead; the entity is
+    only remembered as lacking $apply when the rejection says so.
+    """
+    if (conn.space, entity) not in _apply_unsupported:
+        try:
+            rows = await conn.execute_odata(
+                entity=entity, apply=apply, orderby=orderby, top=1000
+            )
+        except DatasphereQueryError as e:
+            if e.status_code not in _APPLY_REJECTED:
+                raise
+            if e.status_code in _APPLY_UNSUPPORTED or "$apply" in str(e):
+                _apply_unsupported.add((conn.space, entity))
+        else:
+            alias = measure + _APPLY_ALIAS_SUFFIX
+            for row in rows:
+                row[measure] = row.pop(alias, None)
+            return rows
+
+    rows = await conn.execute_odata(
+        entity=entity,
+        select=[*group_by, measure] if group_by else [measure],
+        filter_expr=filter_expr,
+        top=1000,
+    )
+    return _sum_by_group(rows, measure, group_by or [])
+
+
+def _sum_by_group(rows: list[dict], measure: str, group_by: list[str]) -> list[dict]:
+    """Sum raw rows per group, producing the rows $apply would return."""
+    values = _measure_values(rows, measure)
+    if not group_by:
+        return [{measure: sum(v or 0 for v in values)}]
+
+    dims = tuple(group_by)
+    totals: dict[Any, Any] = {}
+    for key, value in zip(_group_keys(rows, dims), values):
+        totals[key] = totals.get(key, 0) + (value or 0)
+
+    single = len(dims) == 1
+    return [
+        {**({dims[0]: key} if single else dict(zip(dims, key))), measure: total}
+        for key, total in totals.items()
+    ]
+
+
+def _aggregation_apply(
+    measure: str,
+    group_by: list[str] | None,
+    filter_expr: str | None,
+) -> str:
+    """Build an OData $apply that sums the measure on the server.
+
+    The backend returns one row per group (or a single total row) instead
+    of raw rows, so only the aggregated values cross the network. The
+    filter goes inside $apply because $filter is evaluated after it. The
+    sum is aliased as measure + _APPLY_ALIAS_SUFFIX.
+    """
+    aggregate = f"aggregate({measure} with sum as {measure}{_APPLY_ALIAS_SUFFIX})"
+    if group_by:
+        step = f"groupby(({','.join(group_by)}),{aggregate})"
+    else:
+        step = aggregate
+    if filter_expr:
+        return f"filter({filter_expr})/{step}"
+    return step
+
+
 def _build_comparison(
     results_a: list[dict],
     results_b: list[dict],
@@ -175,8 +400,8 @@ def _build_comparison(
     """Build comparison records between two result sets."""
     if not group_by:
         # Simple total comparison
-        total_a = sum(r.get(measure, 0) or 0 for r in results_a)
-        total_b = sum(r.get(measure, 0) or 0 for r in results_b)
+        total_a = sum(v or 0 for v in _measure_values(results_a, measure))
+        total_b = sum(v or 0 for v in _measure_values(results_b, measure))
         diff = total_b - total_a
         pct = (diff / total_a * 100) if total_a else 0
 
@@ -189,45 +414,77 @@ def _build_comparison(
             }
         ]
 
-    # Group-by comparison
-    def make_key(row: dict) -> tuple:
-        return tuple(row.get(dim) for dim in group_by)
-
-    index_a = {make_key(r): r.get(measure, 0) for r in results_a}
-    index_b = {make_key(r): r.get(measure, 0) for r in results_b}
-
-    all_keys = set(index_a.keys()) | set(index_b.keys())
+    # Group-by comparison: one map from group key to (value_a, value_b)
+    dims = tuple(group_by)
+    keys_a = _group_keys(results_a, dims)
+    keys_b = _group_keys(results_b, dims)
+    values_a = _measure_values(results_a, measure)
+    values_b = _measure_values(results_b, measure)
+
+    merged: dict[Any, Any]
+    if keys_a == keys_b:
+        # Both sides hold the same groups in the same order: pair them up
+        merged = dict(zip(keys_a, zip(values_a, values_b)))
+    else:
+        merged = {}
+        for key, value in zip(keys_a, values_a):
+            merged.setdefault(key, [0, 0])[0] = value
+        for key, value in zip(keys_b, values_b):
+            merged.setdefault(key, [0, 0])[1] = value
+
+    single = len(dims) == 1
     comparison = []
-
-    for key in sorted(all_keys):
-        val_a = index_a.get(key, 0) or 0
-        val_b = index_b.get(key, 0) or 0
+    for key, (val_a, val_b) in sorted(merged.items()):
+        val_a = val_a or 0
+        val_b = val_b or 0
         diff = val_b - val_a
         pct = (diff / val_a * 100) if val_a else 0
 
-        record = {
-            **dict(zip(group_by, key)),
-            "value_a": val_a,
-            "value_b": val_b,
-            "difference": diff,
-            "difference_pct": round(pct, 2),
-        }
+        record = {dims[0]: key} if single else dict(zip(dims, key))
+        record["value_a"] = val_a
+        record["value_b"] = val_b
+        record["difference"] = diff
+        record["difference_pct"] = round(pct, 2)
         comparison.append(record)
 
     return comparison
 
 
-def _summarize_comparison(
-    comparison: list[dict],
-    measure: str,
-) -> dict[str, Any]:
-    """Generate summary statistics for a comparison."""
-    total_a = sum(c["value_a"] for c in comparison)
-    total_b = sum(c["value_b"] for c in comparison)
+def _group_keys(rows: list[dict], dims: tuple[str, ...]) -> list:
+    """Extract the group key of every row.
+
+    Keys are bare values for a single dimension and tuples otherwise, as
+    returned by itemgetter. Aggregated OData rows always carry every
+    group-by field; rows missing one fall back to None for it.
+    """
+    try:
+        return list(map(itemgetter(*dims), rows))
+    except KeyError:
+        if len(dims) == 1:
+            return [row.get(dims[0]) for row in rows]
+        return [tuple(map(row.get, dims)) for row in rows]
+
+
+def _measure_values(rows: list[dict], measure: str) -> list:
+    """Extract the measure of every row, using 0 where it is missing."""
+    try:
+        return list(map(itemgetter(measure), rows))
+    except KeyError:
+        return [row.get(measure, 0) for row in rows]
+
+
+def _summarize_comparison(comparison: list[dict]) -> dict[str, Any]:
+    """Generate summary statistics for a comparison.
+
+    Records come from _build_comparison, which always sets every key, so
+    the reductions use itemgetter/map instead of per-row Python lambdas.
+    """
+    total_a = sum(map(_get_value_a, comparison))
+    total_b = sum(map(_get_value_b, comparison))
     total_diff = total_b - total_a
     total_pct = (total_diff / total_a * 100) if total_a else 0
 
-    mismatches = [c for c in comparison if abs(c["difference_pct"]) > 1]
+    mismatches = sum(abs(pct) > 1 for pct in map(_get_difference_pct, comparison))
 
     return {
         "total_a": total_a,
@@ -235,8 +492,11 @@ def _summarize_comparison(
         "total_difference": total_diff,
         "total_difference_pct": round(total_pct, 2),
         "records_compared": len(comparison),
-        "mismatches_over_1pct": len(mismatches),
-        "largest_differences": sorted(
-            comparison, key=lambda x: abs(x["difference"]), reverse=True
-        )[:5],
+        "mismatches_over_1pct": mismatches,
+        "largest_differences": heapq.nlargest(5, comparison, key=_abs_difference),
     }
+
+
+def _abs_difference(record: dict) -> float:
+    """Sort key for the largest absolute differences."""
+    return abs(record["difference"])
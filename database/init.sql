@@ -100,6 +100,67 @@ CREATE INDEX idx_fi_customer ON fi_reporting(customer);
 CREATE INDEX idx_fi_vendor ON fi_reporting(vendor);
 CREATE INDEX idx_fi_pst_date ON fi_reporting(pst_date);
 
+-- Pre-aggregated summary of fi_reporting over the dimensions exposed in
+-- config/sources.yaml. Any GROUP BY over a subset of these columns can be
+-- answered from here instead of scanning line items. Populated by seed.sql;
+-- refresh after each load with: SELECT refresh_aggregate('fi_reporting_summary');
+-- Existing databases get it from database/migrations/001_fi_reporting_summary.sql.
+-- Query routing to it is opt-in via `aggregates` in config/sources.yaml.
+CREATE MATERIALIZED VIEW fi_reporting_summary AS
+SELECT
+    compcode,
+    fiscper,
+    gl_acct,
+    segment,
+    prof_ctr,
+    SUM(cs_trn_lc)  AS cs_trn_lc,
+    SUM(quantity)   AS quantity
+FROM fi_reporting
+GROUP BY compcode, fiscper, gl_acct, segment, prof_ctr
+WITH NO DATA;
+
+CREATE INDEX idx_fi_summary_compcode_fiscper ON fi_reporting_summary(compcode, fiscper);
+
+-- Freshness bookkeeping for pre-aggregated materialized views. A statement
+-- trigger on each base table stamps base_changed_at; refresh_aggregate()
+-- stamps refreshed_at. The query engine only reads a view whose
+-- refreshed_at >= base_changed_at and falls back to the base table otherwise.
+CREATE TABLE IF NOT EXISTS aggregate_refresh (
+    view_name        TEXT PRIMARY KEY,
+    base_changed_at  TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp(),
+    refreshed_at     TIMESTAMPTZ
+);
+
+CREATE OR REPLACE FUNCTION mark_aggregate_stale() RETURNS trigger AS $$
+BEGIN
+    UPDATE aggregate_refresh
+    SET base_changed_at = clock_timestamp()
+    WHERE view_name = TG_ARGV[0];
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Refresh a view and record when. The tracking row is locked first, so
+-- writes that land during the refresh wait and then mark the view stale again.
+-- Run after every load into the base table:
+--   SELECT refresh_aggregate('fi_reporting_summary');
+CREATE OR REPLACE FUNCTION refresh_aggregate(name TEXT) RETURNS void AS $$
+DECLARE
+    started TIMESTAMPTZ;
+BEGIN
+    PERFORM 1 FROM aggregate_refresh WHERE view_name = name FOR UPDATE;
+    started := clock_timestamp();
+    EXECUTE format('REFRESH MATERIALIZED VIEW %s', name::regclass);
+    UPDATE aggregate_refresh SET refreshed_at = started WHERE view_name = name;
+END;
+$$ LANGUAGE plpgsql;
+
+INSERT INTO aggregate_refresh (view_name) VALUES ('fi_reporting_summary');
+
+CREATE TRIGGER fi_reporting_mark_summary_stale
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON fi_reporting
+    FOR EACH STATEMENT EXECUTE FUNCTION mark_aggregate_stale('fi_reporting_summary');
+
 -- ============================================================================
 -- Table: consolidation_mart
 -- Purpose: Consolidation data mart for BPC integration
@@ -0,0 +1,69 @@
+-- ============================================================================
+-- Migration 001: fi_reporting_summary
+-- Adds the pre-aggregated summary of fi_reporting to databases created before
+-- it was part of init.sql. Safe to run more than once:
+--   psql "$BUSINESS_DATABASE_URL" -f database/migrations/001_fi_reporting_summary.sql
+--
+-- The view is a snapshot. Refresh it after every load into fi_reporting:
+--   SELECT refresh_aggregate('fi_reporting_summary');
+-- Until then the query engine sees it as stale and reads fi_reporting.
+-- ============================================================================
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS fi_reporting_summary AS
+SELECT
+    compcode,
+    fiscper,
+    gl_acct,
+    segment,
+    prof_ctr,
+    SUM(cs_trn_lc)  AS cs_trn_lc,
+    SUM(quantity)   AS quantity
+FROM fi_reporting
+GROUP BY compcode, fiscper, gl_acct, segment, prof_ctr;
+
+CREATE INDEX IF NOT EXISTS idx_fi_summary_compcode_fiscper
+    ON fi_reporting_summary(compcode, fiscper);
+
+-- Freshness bookkeeping for pre-aggregated materialized views. A statement
+-- trigger on each base table stamps base_changed_at; refresh_aggregate()
+-- stamps refreshed_at. The query engine only reads a view whose
+-- refreshed_at >= base_changed_at and falls back to the base table otherwise.
+CREATE TABLE IF NOT EXISTS aggregate_refresh (
+    view_name        TEXT PRIMARY KEY,
+    base_changed_at  TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp(),
+    refreshed_at     TIMESTAMPTZ
+);
+
+CREATE OR REPLACE FUNCTION mark_aggregate_stale() RETURNS trigger AS $$
+BEGIN
+    UPDATE aggregate_refresh
+    SET base_changed_at = clock_timestamp()
+    WHERE view_name = TG_ARGV[0];
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Refresh a view and record when. The tracking row is locked first, so
+-- writes that land during the refresh wait and then mark the view stale again.
+-- Run after every load into the base table:
+--   SELECT refresh_aggregate('fi_reporting_summary');
+CREATE OR REPLACE FUNCTION refresh_aggregate(name TEXT) RETURNS void AS $$
+DECLARE
+    started TIMESTAMPTZ;
+BEGIN
+    PERFORM 1 FROM aggregate_refresh WHERE view_name = name FOR UPDATE;
+    started := clock_timestamp();
+    EXECUTE format('REFRESH MATERIALIZED VIEW %s', name::regclass);
+    UPDATE aggregate_refresh SET refreshed_at = started WHERE view_name = name;
+END;
+$$ LANGUAGE plpgsql;
+
+INSERT INTO aggregate_refresh (view_name) VALUES ('fi_reporting_summary')
+ON CONFLICT (view_name) DO NOTHING;
+
+DROP TRIGGER IF EXISTS fi_reporting_mark_summary_stale ON fi_reporting;
+CREATE TRIGGER fi_reporting_mark_summary_stale
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON fi_reporting
+    FOR EACH STATEMENT EXECUTE FUNCTION mark_aggregate_stale('fi_reporting_summary');
+
+SELECT refresh_aggregate('fi_reporting_summary');
@@ -523,3 +523,6 @@ INSERT INTO bpc_reporting (
 -- - Multiple functional areas: SALES, COGS, ADMIN, RND
 -- - Multiple data sources: FI_DATA, CO_DATA, BPC_PLAN, BPC_FCST, MANUAL
 -- ============================================================================
+
+-- Populate pre-aggregated views now that base data is loaded
+SELECT refresh_aggregate('fi_reporting_summary');
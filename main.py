@@ -1,15 +1,19 @@
 """Skillian - SAP BW AI Assistant."""
 
+import asyncio
 import logging
+import queue
 import sys
+import threading
 from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api import router
 from app.config import get_settings
-from app.db import close_db, init_db
+from app.db import close_db, init_db, pool_status, warm_pool
 from app.dependencies import (
     get_business_connector,
     get_datasphere_connector,
@@ -18,25 +22,98 @@ from app.dependencies import (
     get_skill_registry,
 )
 
+# Root logger feed and output, shared by every lifespan run. The queue
+# handler is only attached while a listener drains the queue; otherwise the
+# stream handler writes directly, so no record is left unread in the queue.
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_queue_handler = QueueHandler(_log_queue)
+_stream_handler = logging.StreamHandler(sys.stdout)
+_stream_handler.setFormatter(
+    logging.Formatter("%(asctime)s | %(levelname)s | %(name)s | %(message)s")
+)
 
-def _setup_logging(debug: bool = False) -> None:
-    """Configure application logging."""
-    level = logging.DEBUG if debug else logging.INFO
-    logging.basicConfig(
-        level=level,
-        format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-        stream=sys.stdout,
-    )
+
+def _setup_logging(debug: bool = False) -> QueueListener:
+    """Configure application logging.
+
+    Log calls only enqueue the record; a listener thread formats it and
+    writes to stdout, so request handlers never block on the stream.
+    The caller passes the returned listener to _stop_logging on shutdown.
+    """
+    root = logging.getLogger()
+    root.setLevel(logging.DEBUG if debug else logging.INFO)
+    root.removeHandler(_stream_handler)
+    root.addHandler(_queue_handler)
+
+    listener = QueueListener(_log_queue, _stream_handler)
+    listener.start()
+    return listener
+
+
+def _stop_logging(listener: QueueListener) -> None:
+    """Flush queued records and go back to writing to stdout directly."""
+    root = logging.getLogger()
+    root.removeHandler(_queue_handler)
+    listener.stop()
+    root.addHandler(_stream_handler)
 
 
 logger = logging.getLogger(__name__)
 
 
+async def _connect_datasphere(datasphere) -> None:
+    """Initialize the Datasphere connector if configured."""
+    if not datasphere:
+        return
+    try:
+        await datasphere.connect()
+        logger.info("Datasphere connector initialized for space: %s", datasphere.space)
+    except Exception as e:
+        logger.warning("Datasphere initialization failed: %s", e)
+
+
+# Seconds to wait before retrying failed knowledge ingestion; doubles per
+# failure up to the maximum
+_RAG_RETRY_DELAY = 5.0
+_RAG_RETRY_MAX_DELAY = 300.0
+
+
+async def _ingest_knowledge(app: FastAPI, stop: threading.Event) -> None:
+    """Ingest skill knowledge into the vector store, retrying on failure.
+
+    Creating the vector store opens a synchronous database connection and
+    embedding is blocking work, so both run in a worker thread. Sets
+    app.state.rag_ready once the knowledge base can be queried; until then
+    app.state.rag_error holds the last failure, if any. Checks stop between
+    skills and between attempts, so shutdown only waits for the skill
+    currently being ingested.
+    """
+    delay = _RAG_RETRY_DELAY
+    while not stop.is_set():
+        try:
+            manager = await asyncio.to_thread(get_rag_manager)
+            results = await asyncio.to_thread(manager.ingest_all_skills, stop.is_set)
+        except Exception as e:
+            app.state.rag_error = str(e)
+            logger.warning("RAG initialization failed, retrying in %.0fs: %s", delay, e)
+            if await asyncio.to_thread(stop.wait, delay):
+                return
+            delay = min(delay * 2, _RAG_RETRY_MAX_DELAY)
+            continue
+
+        if stop.is_set():
+            return
+        total = sum(results.values())
+        logger.info("Knowledge ingested: %d chunks from %d skills", total, len(results))
+        app.state.rag_error = None
+        app.state.rag_ready = True
+        return
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
-    settings = get_settings()
-    _setup_logging(settings.debug)
+    log_listener = _setup_logging(settings.debug)
 
     provider = get_llm_provider()
     registry = get_skill_registry()
@@ -46,34 +123,43 @@ async def lifespan(app: FastAPI):
     # Initialize database
     await init_db()
     logger.info("Database initialized")
+    try:
+        await warm_pool(settings.db_pool_size)
+        logger.info("Database pool warmed: %s", pool_status())
+    except Exception as e:
+        logger.warning("Database pool warm-up failed: %s", e)
     logger.info("Environment: %s", settings.env)
     logger.info("LLM Provider: %s (%s)", provider.provider_name, provider.model_name)
     logger.info("Skills registered: %d", registry.skill_count)
     logger.info("Tools available: %d", registry.tool_count)
 
-    # Initialize Datasphere connector if configured
-    datasphere = get_datasphere_connector()
-    if datasphere:
-        try:
-            await datasphere.connect()
-            logger.info("Datasphere connector initialized for space: %s", datasphere.space)
-        except Exception as e:
-            logger.warning("Datasphere initialization failed: %s", e)
-
-    # Ingest knowledge on startup
+    # Build the RAG manager once here, so requests never race the ingestion
+    # thread to construct it; a failure is retried by _ingest_knowledge
+    app.state.rag_ready = False
+    app.state.rag_error = None
     try:
-        rag_manager = get_rag_manager()
-        results = rag_manager.ingest_all_skills()
-        total = sum(results.values())
-        logger.info("Knowledge ingested: %d chunks from %d skills", total, len(results))
+        await asyncio.to_thread(get_rag_manager)
     except Exception as e:
-        logger.warning("RAG initialization failed: %s", e)
+        app.state.rag_error = str(e)
+        logger.warning("RAG manager initialization failed: %s", e)
+
+    # Ingest knowledge in the background; /health reports degraded until done
+    rag_stop = threading.Event()
+    rag_task = asyncio.create_task(_ingest_knowledge(app, rag_stop))
+
+    datasphere = get_datasphere_connector()
+    await _connect_datasphere(datasphere)
 
     yield
 
     # Cleanup resources
     logger.info("Shutting down...")
 
+    # Cancelling the task would not stop its worker thread, which could then
+    # outlive close_db(); ask it to stop and wait for it instead
+    rag_stop.set()
+    await rag_task
+
     # Close Datasphere connector
     if datasphere:
         try:
@@ -91,8 +177,10 @@ async def lifespan(app: FastAPI):
 
     await close_db()
     logger.info("Shutdown complete")
+    _stop_logging(log_listener)
 
 
+# Resolved once at import; lifespan reads the same instance
 settings = get_settings()
 
 # Configure CORS based on environment
@@ -105,18 +193,21 @@ app = FastAPI(
     title=settings.app_name,
     description="SAP BW AI Assistant with domain-specific skills for data diagnostics",
     version=settings.app_version,
-    debug=settings.debug,
+    # Debug tracebacks are never served outside development, whatever DEBUG says
+    debug=settings.debug and settings.is_development,
     lifespan=lifespan,
 )
 
-# CORS middleware for frontend access
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=allowed_origins,
-    allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE"],
-    allow_headers=["Content-Type", "Authorization"],
-)
+# CORS middleware for frontend access; with no allowed origins it would
+# reject every cross-origin request anyway, so skip the extra layer
+if allowed_origins:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=allowed_origins,
+        allow_credentials=True,
+        allow_methods=["GET", "POST", "PUT", "DELETE"],
+        allow_headers=["Content-Type", "Authorization"],
+    )
 
 # Include API routes
 app.include_router(router, prefix="/api/v1")
@@ -130,4 +221,5 @@ if __name__ == "__main__":
         host=settings.api_host,
         port=settings.api_port,
         reload=settings.is_development,
+        access_log=settings.is_development,
     )
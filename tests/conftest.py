@@ -1,7 +1,9 @@
 """Shared test fixtures."""
 
+import asyncio
 import tempfile
 from collections.abc import Generator
+from dataclasses import dataclass
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
@@ -11,25 +13,39 @@ from pydantic import BaseModel
 from app.config import Settings
 from app.core import SkillRegistry, Tool
 
+# Collection
 
-@pytest.fixture(autouse=True)
-def reset_db_connection():
-    """Reset database connection between tests to avoid event loop issues."""
-    import app.db.connection as db_conn
-    # Reset the global state before each test
-    db_conn._engine = None
-    db_conn._async_session_factory = None
-    yield
-    # Reset again after test
-    db_conn._engine = None
-    db_conn._async_session_factory = None
+# Modules where every test is marked integration; importing them is skipped
+# unless --integration asks for them
+collect_ignore_glob: list[str] = []
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--integration",
+        action="store_true",
+        default=False,
+        help="collect integration-only test modules (combine with -m integration)",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    if not config.getoption("integration"):
+        collect_ignore_glob.append("test_*integration.py")
+    # Run async tests on uvloop where uvicorn[standard] has installed it;
+    # pytest-asyncio builds its loops from the current policy
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
 
 # Settings Fixtures
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_settings() -> Settings:
-    """Test settings with defaults."""
+    """Test settings with defaults, validated once; tests must not mutate them."""
     return Settings(
         env="development",
         debug=True,
@@ -127,50 +143,60 @@ def skill_registry(test_skill: TestSkill) -> SkillRegistry:
 
 # LLM Mocks
 
+@dataclass(frozen=True, slots=True)
+class _ChatResponse:
+    """Plain stand-in for a chat model reply; cheaper than a MagicMock."""
+    content: str
+    tool_calls: list[dict] | None = None
+
+
 @pytest.fixture
-def mock_chat_model() -> MagicMock:
-    """Mock LangChain chat model."""
-    model = MagicMock()
+def make_chat_response() -> type[_ChatResponse]:
+    """Factory for canned chat model replies, shared with test modules."""
+    return _ChatResponse
 
-    # Mock response without tool calls
-    mock_response = MagicMock()
-    mock_response.content = "Mock response"
-    mock_response.tool_calls = None
 
-    model.ainvoke = AsyncMock(return_value=mock_response)
+@pytest.fixture
+def mock_chat_model() -> Generator[MagicMock]:
+    """Mock LangChain chat model."""
+    model = MagicMock()
+    model.ainvoke = AsyncMock(return_value=_ChatResponse(content="Mock response"))
     model.bind_tools = MagicMock(return_value=model)
 
-    return model
+    yield model
+    # Drop recorded calls and canned responses so they are not kept alive
+    model.reset_mock(return_value=True, side_effect=True)
 
 
 @pytest.fixture
-def mock_chat_model_with_tool_call() -> MagicMock:
+def mock_chat_model_with_tool_call() -> Generator[MagicMock]:
     """Mock chat model that makes tool calls."""
     model = MagicMock()
-
-    # First response: tool call
-    tool_response = MagicMock()
-    tool_response.content = ""
-    tool_response.tool_calls = [
-        {"id": "call_1", "name": "simple_tool", "args": {"value": "test"}}
-    ]
-
-    # Second response: final answer
-    final_response = MagicMock()
-    final_response.content = "Final answer after tool call"
-    final_response.tool_calls = None
-
-    model.ainvoke = AsyncMock(side_effect=[tool_response, final_response])
+    # First response: tool call; second response: final answer
+    model.ainvoke = AsyncMock(
+        side_effect=[
+            _ChatResponse(
+                content="",
+                tool_calls=[{"id": "call_1", "name": "simple_tool", "args": {"value": "test"}}],
+            ),
+            _ChatResponse(content="Final answer after tool call"),
+        ]
+    )
     model.bind_tools = MagicMock(return_value=model)
 
-    return model
+    yield model
+    model.reset_mock(return_value=True, side_effect=True)
 
 
 # API Fixtures
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client() -> Generator[TestClient]:
-    """FastAPI test client."""
+    """FastAPI test client with the app lifespan.
+
+    Startup (database init, pool warm-up, Datasphere connect, knowledge
+    ingestion) runs once for the whole session rather than once per test.
+    """
     from main import app
     with TestClient(app) as client:
         yield client
@@ -188,7 +214,10 @@ def temp_dir() -> Generator[str]:
 # Mock Embeddings
 
 class MockEmbeddings:
-    """Mock embeddings for testing without real models."""
+    """Mock embeddings for testing without real models.
+
+    Every call builds new lists, so vectors stay independent of each other.
+    """
 
     def __init__(self, dimension: int = 384):
         self.dimension = dimension
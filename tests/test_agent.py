@@ -1,5 +1,6 @@
 """Tests for Agent."""
 
+from decimal import Decimal
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
@@ -43,7 +44,9 @@ class TestAgent:
     def mock_model(self):
         model = MagicMock()
         model.bind_tools = MagicMock(return_value=model)
-        return model
+        yield model
+        # bind_tools returns the model itself; break that cycle on teardown
+        model.reset_mock(return_value=True, side_effect=True)
 
     def test_agent_creates_with_empty_registry(self, mock_model):
         registry = SkillRegistry()
@@ -62,11 +65,9 @@ class TestAgent:
         assert agent.conversation.messages[0].content is not None
 
     @pytest.mark.asyncio
-    async def test_process_simple_response(self, mock_model, registry):
+    async def test_process_simple_response(self, mock_model, registry, make_chat_response):
         # Mock a simple response without tool calls
-        mock_response = MagicMock()
-        mock_response.content = "Hello! How can I help?"
-        mock_response.tool_calls = None
+        mock_response = make_chat_response(content="Hello! How can I help?")
 
         mock_model.ainvoke = AsyncMock(return_value=mock_response)
         mock_model.bind_tools = MagicMock(return_value=mock_model)
@@ -79,18 +80,15 @@ class TestAgent:
         assert len(response.tool_calls_made) == 0
 
     @pytest.mark.asyncio
-    async def test_process_with_tool_call(self, mock_model, registry):
+    async def test_process_with_tool_call(self, mock_model, registry, make_chat_response):
         # First response has tool call
-        tool_call_response = MagicMock()
-        tool_call_response.content = ""
-        tool_call_response.tool_calls = [
-            {"id": "call_123", "name": "dummy_query", "args": {"query": "test"}}
-        ]
+        tool_call_response = make_chat_response(
+            content="",
+            tool_calls=[{"id": "call_123", "name": "dummy_query", "args": {"query": "test"}}],
+        )
 
         # Second response is final
-        final_response = MagicMock()
-        final_response.content = "The result is: Processed: test"
-        final_response.tool_calls = None
+        final_response = make_chat_response(content="The result is: Processed: test")
 
         mock_model.ainvoke = AsyncMock(side_effect=[tool_call_response, final_response])
         mock_model.bind_tools = MagicMock(return_value=mock_model)
@@ -103,6 +101,34 @@ class TestAgent:
         assert len(response.tool_calls_made) == 1
         assert response.tool_calls_made[0]["tool"] == "dummy_query"
 
+    @pytest.mark.asyncio
+    async def test_execute_tool_encodes_compact_json(self, mock_model):
+        def decimal_tool(query: str) -> dict:
+            return {"amount": Decimal("123456789012345678.25"), "label": query}
+
+        registry = SkillRegistry()
+        registry.register(
+            ConfiguredSkill(
+                name="numbers",
+                description="Numeric results",
+                system_prompt="",
+                tools=[
+                    Tool(
+                        name="decimal_query",
+                        description="Returns a Decimal",
+                        function=decimal_tool,
+                        input_schema=DummyInput,
+                    )
+                ],
+            )
+        )
+        agent = Agent(mock_model, registry)
+
+        result = await agent._execute_tool("decimal_query", {"query": "ü"})
+
+        # Decimals are sent as exact strings, not rounded floats
+        assert result == '{"amount":"123456789012345678.25","label":"ü"}'
+
     def test_reset_keeps_system_prompt(self, mock_model, registry):
         agent = Agent(mock_model, registry)
         agent.conversation.add_user("Test message")
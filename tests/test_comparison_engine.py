@@ -82,9 +82,23 @@ def mock_registry(source_a, source_b, comparison_config):
 
 @pytest.fixture
 def mock_query_engine():
-    """Mock query engine."""
+    """Mock query engine.
+
+    query_many fans out to the query mock, so tests queue one QueryResult
+    per source on query.side_effect.
+    """
     engine = AsyncMock()
     engine.query = AsyncMock()
+
+    async def query_many(requests):
+        return [
+            await engine.query(
+                r.source, dimensions=r.dimensions, measures=r.measures, filters=r.filters
+            )
+            for r in requests
+        ]
+
+    engine.query_many = AsyncMock(side_effect=query_many)
     return engine
 
 
@@ -235,6 +249,13 @@ class TestComparisonEngine:
         row2 = next(r for r in result.rows if r.key["company"] == "2000")
         assert row2.status == DiffStatus.MAJOR_DIFF
 
+        assert result.summary["total_source_a"] == 6000.0
+        assert result.summary["total_source_b"] == 11050.0
+        assert result.summary["total_absolute_diff"] == 5050.0
+        assert result.summary["match_count"] == 0
+        assert result.summary["minor_diff_count"] == 1
+        assert result.summary["major_diff_count"] == 1
+
     @pytest.mark.asyncio
     async def test_compare_with_missing_rows(
         self, comparison_engine, mock_query_engine
@@ -315,6 +336,7 @@ class TestComparisonEngine:
 
         # Query engine should only be called twice (first call)
         assert mock_query_engine.query.call_count == 2
+        assert mock_query_engine.query_many.call_count == 1
         assert result1.cache_key == result2.cache_key
 
     @pytest.mark.asyncio
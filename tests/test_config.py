@@ -11,6 +11,9 @@ class TestSettings:
         assert settings.env == "development"
         assert settings.debug is True
         assert settings.llm_provider == "ollama"
+        assert settings.db_pool_size == 5
+        assert settings.db_max_overflow == 10
+        assert settings.db_pool_recycle == 1800
 
     def test_is_development(self):
         settings = Settings(env="development")
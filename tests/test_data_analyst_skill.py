@@ -1,5 +1,7 @@
 """Tests for data analyst skill."""
 
+import os
+from collections import OrderedDict
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -7,6 +9,7 @@ import pytest
 
 from app.core import ConfiguredSkill
 from app.core.skill_loader import SkillLoader
+from app.skills.data_analyst import tools as tools_module
 from app.skills.data_analyst.comparison_engine import ComparisonResult, DiffStatus, RowComparison
 from app.skills.data_analyst.query_engine import QueryResult
 from app.skills.data_analyst.source_registry import (
@@ -17,7 +20,11 @@ from app.skills.data_analyst.source_registry import (
     SourceDef,
     SourceRegistry,
 )
-from app.skills.data_analyst.tools import DataAnalystTools
+from app.skills.data_analyst.tools import (
+    DataAnalystTools,
+    _classify_alignment,
+    _format_comparison_result,
+)
 
 
 @pytest.fixture
@@ -39,6 +46,13 @@ def mock_registry():
         },
     ]
     registry.get_common_dimensions.return_value = ["company", "period"]
+    registry.get_comparison_pairs.return_value = [
+        {
+            "source_a": "source_a",
+            "source_b": "source_b",
+            "common_dimensions": ["company", "period"],
+        },
+    ]
     registry.get.return_value = SourceDef(
         name="source_a",
         description="Source A",
@@ -175,6 +189,13 @@ class TestDataAnalystTools:
         assert result["total_count"] == 2
         assert "available_comparisons" in result
 
+    def test_list_sources_response_built_once(self, tool_impl, mock_registry):
+        """Test list_sources reuses its response across calls."""
+        first = tool_impl.list_sources()
+
+        assert tool_impl.list_sources() is first
+        mock_registry.get_source_info.assert_called_once()
+
     def test_list_sources_shows_comparison_pairs(self, tool_impl):
         """Test list_sources shows valid comparison pairs."""
         result = tool_impl.list_sources()
@@ -252,3 +273,142 @@ class TestDataAnalystTools:
         assert diff["key"]["company"] == "2000"
         assert diff["diff"] == 1000.0
         assert diff["status"] == "major_diff"
+
+
+class TestFormatComparisonResult:
+    """Test formatting of comparison results for the LLM."""
+
+    @staticmethod
+    def _row(company: str, diff: float, status: DiffStatus) -> RowComparison:
+        return RowComparison(
+            key={"company": company},
+            source_a_value=1000.0,
+            source_b_value=1000.0 + diff,
+            absolute_diff=diff,
+            percentage_diff=diff / 10,
+            status=status,
+        )
+
+    def test_top_differences_largest_five_non_matching(self):
+        rows = [
+            self._row("M1", 5000.0, DiffStatus.MATCH),
+            self._row("A", 10.0, DiffStatus.MINOR_DIFF),
+            self._row("B", 900.0, DiffStatus.MAJOR_DIFF),
+            self._row("C", 300.0, DiffStatus.MINOR_DIFF),
+            self._row("D", 700.0, DiffStatus.MAJOR_DIFF),
+            self._row("E", 50.0, DiffStatus.MINOR_DIFF),
+            self._row("F", 400.0, DiffStatus.MAJOR_DIFF),
+        ]
+        result = ComparisonResult(
+            source_a="source_a",
+            source_b="source_b",
+            measure="amount",
+            align_on=["company"],
+            rows=rows,
+            summary={"match_count": 1, "minor_diff_count": 3, "major_diff_count": 3},
+            cache_key="key",
+        )
+
+        formatted = _format_comparison_result(result)
+
+        assert [d["key"]["company"] for d in formatted["top_differences"]] == [
+            "B",
+            "D",
+            "F",
+            "C",
+            "E",
+        ]
+
+
+class TestToolsInstanceCache:
+    """Test the module-level tools and registry caches."""
+
+    @pytest.fixture(autouse=True)
+    def reset_caches(self, monkeypatch):
+        monkeypatch.setattr(tools_module, "_tools_cache", OrderedDict())
+        monkeypatch.setattr(tools_module, "_registry_cache", {})
+
+    def test_new_connector_reuses_registry(self):
+        first = tools_module._get_tools_instance(MagicMock())
+        second = tools_module._get_tools_instance(MagicMock())
+
+        assert second is not first
+        assert second._registry is first._registry
+
+    def test_same_connector_reuses_instance(self):
+        connector = MagicMock()
+
+        assert tools_module._get_tools_instance(connector) is tools_module._get_tools_instance(
+            connector
+        )
+
+    def test_alternating_connectors_keep_their_instances(self):
+        connector_a = MagicMock()
+        connector_b = MagicMock()
+
+        first_a = tools_module._get_tools_instance(connector_a)
+        first_b = tools_module._get_tools_instance(connector_b)
+
+        assert tools_module._get_tools_instance(connector_a) is first_a
+        assert tools_module._get_tools_instance(connector_b) is first_b
+
+    def test_cache_evicts_least_recently_used(self):
+        connectors = [MagicMock() for _ in range(tools_module._TOOLS_CACHE_SIZE)]
+        instances = [tools_module._get_tools_instance(c) for c in connectors]
+        # Touch the oldest entry, so the second one is least recently used
+        tools_module._get_tools_instance(connectors[0])
+
+        tools_module._get_tools_instance(MagicMock())
+
+        assert len(tools_module._tools_cache) == tools_module._TOOLS_CACHE_SIZE
+        assert id(connectors[1]) not in tools_module._tools_cache
+        assert tools_module._get_tools_instance(connectors[0]) is instances[0]
+        assert tools_module._get_tools_instance(connectors[2]) is instances[2]
+
+    def test_reused_id_does_not_return_another_connectors_tools(self):
+        connector = MagicMock()
+        stale = tools_module._get_tools_instance(connector)
+        # Simulate a new object that got the id of a collected one
+        other = MagicMock()
+        tools_module._tools_cache[id(other)] = tools_module._tools_cache.pop(id(connector))
+
+        assert tools_module._get_tools_instance(other) is not stale
+
+    def test_registry_reloaded_when_config_changes(self, tmp_path):
+        config_path = tmp_path / "sources.yaml"
+        config_path.write_text(Path("config/sources.yaml").read_text())
+        first = tools_module._get_source_registry(config_path)
+
+        os.utime(config_path, (0, config_path.stat().st_mtime + 10))
+
+        assert tools_module._get_source_registry(config_path) is not first
+
+
+class TestAlignmentClassification:
+    """Test match-percentage banding used in interpretations."""
+
+    @pytest.mark.parametrize(
+        ("match_pct", "expected"),
+        [
+            (0, "poor"),
+            (49.9, "poor"),
+            (50, "moderate"),
+            (89.9, "moderate"),
+            (90, "good"),
+            (99.9, "good"),
+            (100, "perfect"),
+        ],
+    )
+    def test_classify_alignment(self, match_pct, expected):
+        assert _classify_alignment(match_pct) == expected
+
+    @pytest.mark.asyncio
+    async def test_interpretation_uses_band_template(self, tool_impl):
+        result = await tool_impl.compare_sources(
+            source_a="source_a", source_b="source_b", measure="amount"
+        )
+
+        assert result["interpretation"] == (
+            "Moderate alignment (50.0% match). "
+            "1 rows have major differences requiring investigation."
+        )
@@ -131,6 +131,48 @@ class TestDatasphereConnector:
         with pytest.raises(DatasphereError, match="not connected"):
             await connector.execute_sql("SELECT * FROM test")
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("query", "sent"),
+        [
+            # Own top-level limits within the cap are left alone
+            ("SELECT * FROM test LIMIT 10", "SELECT * FROM test LIMIT 10"),
+            ("SELECT * FROM test LIMIT 10 OFFSET 20;", "SELECT * FROM test LIMIT 10 OFFSET 20;"),
+            ("SELECT TOP 10 * FROM test", "SELECT TOP 10 * FROM test"),
+            # Everything else is wrapped, so the query itself stays intact
+            (
+                "SELECT * FROM test ORDER BY amount DESC ;",
+                "SELECT * FROM (\nSELECT * FROM test ORDER BY amount DESC\n) AS capped LIMIT 501",
+            ),
+            (
+                "SELECT * FROM test LIMIT 1000000",
+                "SELECT * FROM (\nSELECT * FROM test LIMIT 1000000\n) AS capped LIMIT 501",
+            ),
+            (
+                "SELECT top_customer FROM (SELECT * FROM t LIMIT 5) -- biggest",
+                "SELECT * FROM (\nSELECT top_customer FROM (SELECT * FROM t LIMIT 5) -- biggest\n)"
+                " AS capped LIMIT 501",
+            ),
+        ],
+    )
+    async def test_execute_sql_max_rows_caps_query(self, connector, query, sent):
+        """A row cap is applied on the server unless the query's own limit is lower."""
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"results": [{"id": 1}]}
+        mock_response.raise_for_status = MagicMock()
+
+        connector._client = AsyncMock()
+        connector._client.post.return_value = mock_response
+        connector._token = OAuthToken(
+            access_token="test-token",
+            expires_at=datetime.now() + timedelta(hours=1),
+        )
+
+        result = await connector.execute_sql(query, max_rows=501)
+
+        assert result == [{"id": 1}]
+        assert connector._client.post.call_args.kwargs["json"] == {"query": sent}
+
     @pytest.mark.asyncio
     async def test_execute_odata_without_connection(self, connector):
         """Should raise error if not connected."""
@@ -144,3 +186,66 @@ class TestDatasphereConnector:
         """Health check should return False if not connected."""
         result = await connector.health_check()
         assert result is False
+
+    @pytest.mark.asyncio
+    async def test_execute_odata_builds_query_params(self, connector):
+        """Only provided OData options are sent."""
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"value": [{"id": 1}]}
+        mock_response.raise_for_status = MagicMock()
+
+        connector._client = AsyncMock()
+        connector._client.get.return_value = mock_response
+        connector._token = OAuthToken(
+            access_token="test-token",
+            expires_at=datetime.now() + timedelta(hours=1),
+        )
+
+        result = await connector.execute_odata(
+            "test_entity", select=["A", "B"], top=10, orderby="A desc"
+        )
+
+        assert result == [{"id": 1}]
+        params = connector._client.get.call_args.kwargs["params"]
+        assert params == {"$select": "A,B", "$top": "10", "$orderby": "A desc"}
+
+    @pytest.mark.asyncio
+    async def test_execute_odata_sends_apply(self, connector):
+        """An $apply transformation is passed through unchanged."""
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"value": [{"AMOUNT": 300}]}
+        mock_response.raise_for_status = MagicMock()
+
+        connector._client = AsyncMock()
+        connector._client.get.return_value = mock_response
+        connector._token = OAuthToken(
+            access_token="test-token",
+            expires_at=datetime.now() + timedelta(hours=1),
+        )
+
+        await connector.execute_odata(
+            "test_entity", apply="aggregate(AMOUNT with sum as AMOUNT)"
+        )
+
+        params = connector._client.get.call_args.kwargs["params"]
+        assert params == {"$apply": "aggregate(AMOUNT with sum as AMOUNT)"}
+
+    @pytest.mark.asyncio
+    async def test_execute_odata_error_carries_status(self, connector):
+        """A rejected request reports the HTTP status on the error."""
+        import httpx
+
+        request = httpx.Request("GET", "https://test.datasphere.cloud.sap/x")
+        response = httpx.Response(501, text="$apply not implemented", request=request)
+
+        connector._client = AsyncMock()
+        connector._client.get.return_value = response
+        connector._token = OAuthToken(
+            access_token="test-token",
+            expires_at=datetime.now() + timedelta(hours=1),
+        )
+
+        with pytest.raises(DatasphereQueryError) as exc_info:
+            await connector.execute_odata("test_entity", apply="aggregate(A with sum as A)")
+
+        assert exc_info.value.status_code == 501
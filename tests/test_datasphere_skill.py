@@ -4,7 +4,9 @@ from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from pydantic import ValidationError
 
+from app.connectors.datasphere import DatasphereQueryError
 from app.core.skill_loader import SkillLoader
 from app.skills.datasphere import tools as datasphere_tools
 
@@ -63,6 +65,36 @@ class TestDatasphereSkill:
         tool = skill.get_tool("nonexistent_tool")
         assert tool is None
 
+    def test_tool_inputs_are_frozen(self, skill):
+        tool = skill.get_tool("ds_query_entity")
+        validated = tool.input_schema(entity="view1")
+
+        with pytest.raises(ValidationError):
+            validated.entity = "view2"
+
+    def test_input_schemas_shared_across_connectors(self, skill):
+        other_connector = MagicMock()
+        other = SkillLoader(
+            skills_dir=Path("app/skills"),
+            connector_factory={"datasphere": other_connector},
+        ).load_skill("datasphere")
+
+        tool = skill.get_tool("ds_query_entity")
+        other_tool = other.get_tool("ds_query_entity")
+        assert other_tool.input_schema is tool.input_schema
+        assert other_tool.function is not tool.function
+
+    @pytest.mark.asyncio
+    async def test_call_time_connector_is_ignored(self, skill, mock_connector):
+        other_connector = MagicMock()
+        tool = skill.get_tool("ds_list_entities")
+
+        await tool.function(connector=other_connector)
+
+        mock_connector.list_entities.assert_awaited_once()
+        other_connector.list_entities.assert_not_called()
+        datasphere_tools.invalidate()
+
     def test_system_prompt_not_empty(self, skill):
         assert len(skill.system_prompt) > 100
         assert "Datasphere" in skill.system_prompt
@@ -81,8 +113,10 @@ class TestDatasphereToolFunctions:
         """Set up the module-level connector for tests."""
         # Reset the module-level connector
         datasphere_tools._connector = mock_connector
+        datasphere_tools.invalidate()
         yield
         datasphere_tools._connector = None
+        datasphere_tools.invalidate()
 
     @pytest.mark.asyncio
     async def test_list_entities(self, mock_connector):
@@ -132,6 +166,89 @@ class TestDatasphereToolFunctions:
             orderby="AMOUNT desc",
         )
 
+    @pytest.mark.asyncio
+    async def test_query_entity_reuses_normalized_result(self, mock_connector):
+        first = await datasphere_tools.query_entity(
+            entity="test_view",
+            select=["MATERIAL", "AMOUNT"],
+            filter_expr="MATERIAL eq  'MAT001'",
+            connector=mock_connector,
+        )
+        second = await datasphere_tools.query_entity(
+            entity="test_view",
+            select=["AMOUNT", "MATERIAL"],
+            filter_expr=" MATERIAL eq 'MAT001' ",
+            connector=mock_connector,
+        )
+
+        assert second["rows"] == first["rows"]
+        mock_connector.execute_odata.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_cached_results_expire_and_invalidate(self, mock_connector, monkeypatch):
+        now = 1000.0
+        monkeypatch.setattr(datasphere_tools.time, "monotonic", lambda: now)
+
+        await datasphere_tools.get_entity_metadata("test_view", connector=mock_connector)
+        await datasphere_tools.get_entity_metadata("test_view", connector=mock_connector)
+        assert mock_connector.get_metadata.await_count == 1
+
+        now += datasphere_tools._METADATA_TTL
+        await datasphere_tools.get_entity_metadata("test_view", connector=mock_connector)
+        assert mock_connector.get_metadata.await_count == 2
+
+        await datasphere_tools.list_entities(connector=mock_connector)
+        datasphere_tools.invalidate("test_view")
+        await datasphere_tools.get_entity_metadata("test_view", connector=mock_connector)
+        await datasphere_tools.list_entities(connector=mock_connector)
+        assert mock_connector.get_metadata.await_count == 3
+        mock_connector.list_entities.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_cached_rows_are_not_shared_with_callers(self, mock_connector):
+        first = await datasphere_tools.query_entity(entity="test_view", connector=mock_connector)
+        first["rows"][0]["value"] = -1
+        first["rows"].clear()
+
+        second = await datasphere_tools.query_entity(entity="test_view", connector=mock_connector)
+
+        assert second["rows"] == [{"id": 1, "value": 100}]
+        mock_connector.execute_odata.assert_awaited_once()
+
+    def test_result_cache_is_bounded(self, monkeypatch):
+        now = 1000.0
+        monkeypatch.setattr(datasphere_tools.time, "monotonic", lambda: now)
+        cache = datasphere_tools._ResultCache(maxsize=2)
+
+        cache.set(("a",), 1, ttl=60)
+        cache.set(("b",), 2, ttl=60)
+        cache.get(("a",))
+        cache.set(("c",), 3, ttl=60)
+
+        # "b" was least recently used
+        assert len(cache) == 2
+        assert cache.get(("b",)) is None
+        assert cache.get(("a",)) == 1
+
+        # Expired entries are swept before anything live is evicted
+        cache.set(("d",), 4, ttl=1)
+        now += 30
+        cache.set(("e",), 5, ttl=60)
+        assert cache.get(("a",)) == 1
+        assert cache.get(("e",)) == 5
+
+    @pytest.mark.asyncio
+    async def test_query_errors_are_not_cached(self, mock_connector):
+        mock_connector.execute_odata = AsyncMock(
+            side_effect=[DatasphereQueryError("boom"), [{"id": 1}]]
+        )
+
+        first = await datasphere_tools.query_entity(entity="test_view", connector=mock_connector)
+        second = await datasphere_tools.query_entity(entity="test_view", connector=mock_connector)
+
+        assert first["error"] == "boom"
+        assert second["rows"] == [{"id": 1}]
+
     @pytest.mark.asyncio
     async def test_execute_sql(self, mock_connector):
         result = await datasphere_tools.execute_sql(
@@ -140,7 +257,32 @@ class TestDatasphereToolFunctions:
         )
 
         assert result["row_count"] == 1
-        mock_connector.execute_sql.assert_called_once_with("SELECT * FROM test_view")
+        mock_connector.execute_sql.assert_called_once_with(
+            "SELECT * FROM test_view", max_rows=501
+        )
+
+    @pytest.mark.asyncio
+    async def test_execute_sql_truncates_rows(self, mock_connector):
+        mock_connector.execute_sql = AsyncMock(return_value=[{"id": i} for i in range(501)])
+
+        result = await datasphere_tools.execute_sql(
+            query="SELECT * FROM test_view",
+            connector=mock_connector,
+        )
+
+        assert result["row_count"] == 501
+        assert len(result["rows"]) == 500
+        assert result["truncated"] is True
+
+    @pytest.mark.asyncio
+    async def test_execute_sql_accepts_indented_lowercase_select(self, mock_connector):
+        result = await datasphere_tools.execute_sql(
+            query="\n  select * from test_view",
+            connector=mock_connector,
+        )
+
+        assert "error" not in result
+        mock_connector.execute_sql.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_execute_sql_rejects_non_select(self, mock_connector):
@@ -168,8 +310,8 @@ class TestDatasphereToolFunctions:
     async def test_compare_entities(self, mock_connector):
         mock_connector.execute_odata = AsyncMock(
             side_effect=[
-                [{"MATERIAL": "M1", "AMOUNT": 100}, {"MATERIAL": "M2", "AMOUNT": 200}],
-                [{"MATERIAL": "M1", "AMOUNT": 110}, {"MATERIAL": "M2", "AMOUNT": 190}],
+                [{"MATERIAL": "M1", "AMOUNT_total": 100}, {"MATERIAL": "M2", "AMOUNT_total": 200}],
+                [{"MATERIAL": "M1", "AMOUNT_total": 110}, {"MATERIAL": "M2", "AMOUNT_total": 190}],
             ]
         )
 
@@ -185,13 +327,19 @@ class TestDatasphereToolFunctions:
         assert result["entity_b"] == "target_view"
         assert "comparison" in result
         assert "summary" in result
+        mock_connector.execute_odata.assert_any_await(
+            entity="source_view",
+            apply="groupby((MATERIAL),aggregate(AMOUNT with sum as AMOUNT_total))",
+            orderby="MATERIAL",
+            top=1000,
+        )
 
     @pytest.mark.asyncio
     async def test_compare_entities_without_group_by(self, mock_connector):
         mock_connector.execute_odata = AsyncMock(
             side_effect=[
-                [{"AMOUNT": 100}, {"AMOUNT": 200}],
-                [{"AMOUNT": 150}, {"AMOUNT": 180}],
+                [{"AMOUNT_total": 100}, {"AMOUNT_total": 200}],
+                [{"AMOUNT_total": 150}, {"AMOUNT_total": 180}],
             ]
         )
 
@@ -207,6 +355,121 @@ class TestDatasphereToolFunctions:
         assert result["comparison"][0]["value_a"] == 300
         assert result["comparison"][0]["value_b"] == 330
 
+    @pytest.mark.asyncio
+    async def test_compare_entities_filters_before_aggregating(self, mock_connector):
+        mock_connector.execute_odata = AsyncMock(return_value=[{"AMOUNT_total": 100}])
+
+        await datasphere_tools.compare_entities(
+            entity_a="source_view",
+            entity_b="target_view",
+            measure="AMOUNT",
+            filter_expr="YEAR eq 2024",
+            connector=mock_connector,
+        )
+
+        mock_connector.execute_odata.assert_any_await(
+            entity="target_view",
+            apply="filter(YEAR eq 2024)/aggregate(AMOUNT with sum as AMOUNT_total)",
+            orderby=None,
+            top=1000,
+        )
+
+    @pytest.mark.asyncio
+    async def test_compare_entities_falls_back_when_apply_rejected(self, mock_connector):
+        raw_rows = [
+            {"MATERIAL": "M1", "AMOUNT": 100},
+            {"MATERIAL": "M1", "AMOUNT": 50},
+            {"MATERIAL": "M2", "AMOUNT": 200},
+        ]
+
+        async def execute_odata(**kwargs):
+            if "apply" in kwargs:
+                raise DatasphereQueryError("$apply not implemented", status_code=501)
+            return raw_rows
+
+        mock_connector.execute_odata = AsyncMock(side_effect=execute_odata)
+
+        result = await datasphere_tools.compare_entities(
+            entity_a="source_view",
+            entity_b="target_view",
+            measure="AMOUNT",
+            group_by=["MATERIAL"],
+            filter_expr="YEAR eq 2024",
+            connector=mock_connector,
+        )
+
+        # Raw rows are summed per group on the client
+        assert [(c["MATERIAL"], c["value_a"]) for c in result["comparison"]] == [
+            ("M1", 150),
+            ("M2", 200),
+        ]
+        mock_connector.execute_odata.assert_any_await(
+            entity="source_view",
+            select=["MATERIAL", "AMOUNT"],
+            filter_expr="YEAR eq 2024",
+            top=1000,
+        )
+
+        # The rejection is remembered, so $apply is not retried
+        mock_connector.execute_odata.reset_mock()
+        await datasphere_tools.compare_entities(
+            entity_a="source_view",
+            entity_b="target_view",
+            measure="AMOUNT",
+            group_by=["MATERIAL"],
+            connector=mock_connector,
+        )
+        assert all("apply" not in c.kwargs for c in mock_connector.execute_odata.await_args_list)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("error", "remembered"),
+        [
+            # A bad measure or filter is rejected, but $apply still works
+            (DatasphereQueryError("Property BOGUS not found", status_code=400), False),
+            (DatasphereQueryError("Query option $apply not supported", status_code=400), True),
+            (DatasphereQueryError("Method not allowed", status_code=405), True),
+        ],
+    )
+    async def test_compare_entities_remembers_only_apply_rejections(
+        self, mock_connector, error, remembered
+    ):
+        async def execute_odata(**kwargs):
+            if "apply" in kwargs:
+                raise error
+            return [{"AMOUNT": 100}]
+
+        mock_connector.execute_odata = AsyncMock(side_effect=execute_odata)
+
+        await datasphere_tools.compare_entities(
+            entity_a="source_view",
+            entity_b="target_view",
+            measure="AMOUNT",
+            connector=mock_connector,
+        )
+
+        assert (("TEST_SPACE", "source_view") in datasphere_tools._apply_unsupported) is remembered
+
+    @pytest.mark.asyncio
+    async def test_compare_entities_reports_query_error(self, mock_connector):
+        mock_connector.execute_odata = AsyncMock(
+            side_effect=[[{"AMOUNT_total": 100}], DatasphereQueryError("boom")]
+        )
+
+        result = await datasphere_tools.compare_entities(
+            entity_a="source_view",
+            entity_b="target_view",
+            measure="AMOUNT",
+            connector=mock_connector,
+        )
+
+        assert result == {
+            "error": "boom",
+            "entity_a": "source_view",
+            "entity_b": "target_view",
+        }
+        assert mock_connector.execute_odata.await_count == 2
+
 
 class TestComparisonHelpers:
     def test_build_comparison_with_group_by(self):
@@ -233,6 +496,76 @@ class TestComparisonHelpers:
         assert m2_record["value_b"] == 190
         assert m2_record["difference"] == -10
 
+    def test_build_comparison_keys_missing_on_one_side(self):
+        results_a = [
+            {"COMPANY": "C1", "PERIOD": "P2", "AMOUNT": 50},
+            {"COMPANY": "C1", "PERIOD": "P1", "AMOUNT": 100},
+        ]
+        results_b = [
+            {"COMPANY": "C2", "PERIOD": "P1", "AMOUNT": 70},
+            {"COMPANY": "C1", "PERIOD": "P1", "AMOUNT": None},
+        ]
+
+        comparison = datasphere_tools._build_comparison(
+            results_a, results_b, "AMOUNT", ["COMPANY", "PERIOD"]
+        )
+
+        assert comparison == [
+            {
+                "COMPANY": "C1",
+                "PERIOD": "P1",
+                "value_a": 100,
+                "value_b": 0,
+                "difference": -100,
+                "difference_pct": -100.0,
+            },
+            {
+                "COMPANY": "C1",
+                "PERIOD": "P2",
+                "value_a": 50,
+                "value_b": 0,
+                "difference": -50,
+                "difference_pct": -100.0,
+            },
+            {
+                "COMPANY": "C2",
+                "PERIOD": "P1",
+                "value_a": 0,
+                "value_b": 70,
+                "difference": 70,
+                "difference_pct": 0,
+            },
+        ]
+
+    def test_build_comparison_row_missing_group_field(self):
+        results_a = [{"AMOUNT": 5}]
+        results_b = [{"AMOUNT": 7}]
+
+        comparison = datasphere_tools._build_comparison(
+            results_a, results_b, "AMOUNT", ["MATERIAL"]
+        )
+
+        assert [(c["MATERIAL"], c["difference"]) for c in comparison] == [(None, 2)]
+
+    def test_build_comparison_matching_keys_pair_directly(self):
+        results_a = [
+            {"MATERIAL": "M2", "AMOUNT": 200},
+            {"MATERIAL": "M1", "AMOUNT": None},
+        ]
+        results_b = [
+            {"MATERIAL": "M2", "AMOUNT": 150},
+            {"MATERIAL": "M1", "AMOUNT": 40},
+        ]
+
+        comparison = datasphere_tools._build_comparison(
+            results_a, results_b, "AMOUNT", ["MATERIAL"]
+        )
+
+        assert [(c["MATERIAL"], c["value_a"], c["value_b"]) for c in comparison] == [
+            ("M1", 0, 40),
+            ("M2", 200, 150),
+        ]
+
     def test_summarize_comparison(self):
         comparison = [
             {
@@ -251,10 +584,21 @@ class TestComparisonHelpers:
             },
         ]
 
-        summary = datasphere_tools._summarize_comparison(comparison, "AMOUNT")
+        summary = datasphere_tools._summarize_comparison(comparison)
 
         assert summary["total_a"] == 300
         assert summary["total_b"] == 300
         assert summary["total_difference"] == 0
         assert summary["records_compared"] == 2
         assert summary["mismatches_over_1pct"] == 2
+
+    def test_summarize_comparison_largest_differences(self):
+        comparison = [
+            {"value_a": 100, "value_b": 100 + d, "difference": d, "difference_pct": float(d)}
+            for d in (1, -40, 7, 0, 25, -3, 12)
+        ]
+
+        summary = datasphere_tools._summarize_comparison(comparison)
+
+        assert [c["difference"] for c in summary["largest_differences"]] == [-40, 25, 12, 7, -3]
+        assert summary["mismatches_over_1pct"] == 5
@@ -0,0 +1,46 @@
+"""Tests for database connection helpers."""
+
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.db import connection
+
+
+class _FakeConnection:
+    async def execute(self, statement):
+        return None
+
+
+class _FakeEngine:
+    """Engine whose connect() fails on one attempt and records releases."""
+
+    def __init__(self, fail_on: int):
+        self._fail_on = fail_on
+        self._attempts = 0
+        self.opened = 0
+        self.released = 0
+
+    @asynccontextmanager
+    async def connect(self):
+        self._attempts += 1
+        if self._attempts == self._fail_on:
+            raise ConnectionError("connect failed")
+        self.opened += 1
+        try:
+            yield _FakeConnection()
+        finally:
+            self.released += 1
+
+
+class TestWarmPool:
+    @pytest.mark.asyncio
+    async def test_releases_opened_connections_when_one_fails(self, monkeypatch):
+        engine = _FakeEngine(fail_on=2)
+        monkeypatch.setattr(connection, "_get_engine", lambda: engine)
+
+        with pytest.raises(ConnectionError):
+            await connection.warm_pool(4)
+
+        assert engine.opened == 3
+        assert engine.released == 3
@@ -9,9 +9,8 @@ from app.llm.ollama import OllamaProvider
 
 
 class TestLLMFactory:
-    def test_create_ollama_provider(self):
-        settings = Settings(llm_provider="ollama")
-        provider = create_llm_provider(settings)
+    def test_create_ollama_provider(self, test_settings):
+        provider = create_llm_provider(test_settings)
 
         assert isinstance(provider, OllamaProvider)
         assert provider.provider_name == "ollama"
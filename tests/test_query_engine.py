@@ -1,11 +1,18 @@
 """Tests for query engine."""
 
-from unittest.mock import AsyncMock
+from dataclasses import FrozenInstanceError
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
-from app.skills.data_analyst.query_engine import QueryEngine, QueryResult
-from app.skills.data_analyst.source_registry import DimensionDef, MeasureDef, SourceDef
+from app.skills.data_analyst import query_engine
+from app.skills.data_analyst.query_engine import QueryEngine, QueryRequest, QueryResult
+from app.skills.data_analyst.source_registry import (
+    AggregateDef,
+    DimensionDef,
+    MeasureDef,
+    SourceDef,
+)
 
 
 @pytest.fixture
@@ -123,22 +130,68 @@ class TestQueryEngine:
         assert len(params) == 2
 
     @pytest.mark.asyncio
-    async def test_query_unknown_dimension_raises(self, engine, sample_source):
-        """Test that unknown dimension raises ValueError."""
-        with pytest.raises(ValueError, match="Unknown dimension: unknown"):
-            await engine.query(sample_source, dimensions=["unknown"])
+    @pytest.mark.parametrize(
+        ("kwargs", "message"),
+        [
+            ({"dimensions": ["unknown"]}, "Unknown dimension: unknown"),
+            ({"measures": ["unknown"]}, "Unknown measure: unknown"),
+            ({"filters": {"unknown": "value"}}, "Unknown filter dimension: unknown"),
+            # The first unknown dimension in request order is reported
+            (
+                {"dimensions": ["company", "missing_a", "missing_b"]},
+                "Unknown dimension: missing_a",
+            ),
+        ],
+    )
+    async def test_query_unknown_field_raises(self, engine, sample_source, kwargs, message):
+        """Test that unknown dimensions, measures and filters raise ValueError."""
+        with pytest.raises(ValueError, match=message):
+            await engine.query(sample_source, **kwargs)
 
     @pytest.mark.asyncio
-    async def test_query_unknown_measure_raises(self, engine, sample_source):
-        """Test that unknown measure raises ValueError."""
-        with pytest.raises(ValueError, match="Unknown measure: unknown"):
-            await engine.query(sample_source, measures=["unknown"])
+    async def test_query_many_runs_one_batch(self, engine, sample_source, mock_connector):
+        """Test query_many sends all statements to the connector at once."""
+        mock_connector.execute_many = AsyncMock(
+            return_value=[
+                [{"company": "1000", "amount": 1000.0}],
+                [{"period": "2024001", "amount": 500.0}, {"period": "2024002", "amount": 1.0}],
+            ]
+        )
+
+        results = await engine.query_many([
+            QueryRequest(sample_source, dimensions=["company"], measures=["amount"]),
+            QueryRequest(
+                sample_source,
+                dimensions=["period"],
+                measures=["amount"],
+                filters={"company": "1000"},
+            ),
+        ])
+
+        mock_connector.execute_many.assert_called_once()
+        statements = mock_connector.execute_many.call_args[0][0]
+        assert len(statements) == 2
+        assert "GROUP BY comp_code" in statements[0][0]
+        assert statements[1][1] == ["1000"]
+
+        assert [r.row_count for r in results] == [1, 2]
+        assert results[1].dimensions_used == ["period"]
+        mock_connector.execute.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_query_unknown_filter_dimension_raises(self, engine, sample_source):
-        """Test that unknown filter dimension raises ValueError."""
-        with pytest.raises(ValueError, match="Unknown filter dimension: unknown"):
-            await engine.query(sample_source, filters={"unknown": "value"})
+    async def test_query_many_validates_before_executing(
+        self, engine, sample_source, mock_connector
+    ):
+        """Test an invalid request fails the whole batch up front."""
+        mock_connector.execute_many = AsyncMock()
+
+        with pytest.raises(ValueError, match="Unknown measure: unknown"):
+            await engine.query_many([
+                QueryRequest(sample_source),
+                QueryRequest(sample_source, measures=["unknown"]),
+            ])
+
+        mock_connector.execute_many.assert_not_called()
 
     def test_build_query_basic(self, engine, sample_source):
         """Test basic SQL query building."""
@@ -168,6 +221,178 @@ class TestQueryEngine:
         assert "WHERE fiscal_period = $1" in sql
         assert params == ["2024001"]
 
+    @pytest.mark.asyncio
+    async def test_stream_yields_connector_rows(self, engine, sample_source, mock_connector):
+        """Test stream builds the same SQL as query and yields rows lazily."""
+
+        async def rows(sql, params):
+            yield {"company": "1000", "amount": 1.0}
+            yield {"company": "2000", "amount": 2.0}
+
+        mock_connector.stream = MagicMock(side_effect=rows)
+
+        result = [
+            row
+            async for row in engine.stream(
+                sample_source, dimensions=["company"], filters={"period": "2024001"}
+            )
+        ]
+
+        assert [row["company"] for row in result] == ["1000", "2000"]
+        sql, params = mock_connector.stream.call_args.args
+        assert "GROUP BY comp_code" in sql
+        assert params == ["2024001"]
+
+    def test_build_query_quotes_non_plain_columns(self, engine, sample_source):
+        """Test mixed-case column names are quoted in every clause."""
+        source = sample_source.model_copy(
+            update={"dimensions": {"company": DimensionDef(column="CompCode")}}
+        )
+
+        sql, _ = engine._build_query(source, ["company"], ["amount"], {"company": "1000"})
+
+        assert 'SELECT "CompCode" AS company' in sql
+        assert 'WHERE "CompCode" = $1' in sql
+        assert 'GROUP BY "CompCode"' in sql
+
+    def test_build_query_reuses_sql_for_same_shape(self, engine, sample_source):
+        """Test repeated query shapes reuse SQL and rebind parameters."""
+        sql1, params1 = engine._build_query(
+            sample_source, ["company"], ["amount"], {"period": "2024001"}
+        )
+        sql2, params2 = engine._build_query(
+            sample_source, ["company"], ["amount"], {"period": "2024002"}
+        )
+
+        assert sql2 is sql1
+        assert params1 == ["2024001"]
+        assert params2 == ["2024002"]
+
+    def test_build_query_filter_order_matches_placeholders(self, engine, sample_source):
+        """Test parameters follow placeholder numbering for each filter order."""
+        sql1, params1 = engine._build_query(
+            sample_source, ["account"], ["amount"], {"company": "1000", "period": "2024001"}
+        )
+        sql2, params2 = engine._build_query(
+            sample_source, ["account"], ["amount"], {"period": "2024001", "company": "1000"}
+        )
+
+        assert "comp_code = $1 AND fiscal_period = $2" in sql1
+        assert params1 == ["1000", "2024001"]
+        assert "fiscal_period = $1 AND comp_code = $2" in sql2
+        assert params2 == ["2024001", "1000"]
+
+    def test_build_query_list_filter_uses_any(self, engine, sample_source):
+        """Test list-valued filters bind one array parameter."""
+        sql, params = engine._build_query(
+            sample_source,
+            ["company"],
+            ["amount"],
+            {"company": ("1000", "2000"), "period": "2024001"},
+        )
+
+        assert "comp_code = ANY($1) AND fiscal_period = $2" in sql
+        assert params == [["1000", "2000"], "2024001"]
+
+    def test_build_query_list_and_scalar_filters_cached_separately(
+        self, engine, sample_source
+    ):
+        """Test a scalar and a list filter on the same dimension get distinct SQL."""
+        scalar_sql, _ = engine._build_query(
+            sample_source, ["company"], ["amount"], {"company": "1000"}
+        )
+        list_sql, _ = engine._build_query(
+            sample_source, ["company"], ["amount"], {"company": ["1000", "2000"]}
+        )
+
+        assert "comp_code = $1" in scalar_sql
+        assert "comp_code = ANY($1)" in list_sql
+
+
+class TestAggregateRouting:
+    @pytest.fixture
+    def aggregated_source(self, sample_source):
+        """Sample source with a company/period summary table."""
+        return sample_source.model_copy(
+            update={
+                "measures": {
+                    **sample_source.measures,
+                    "avg_amount": MeasureDef(column="amount_lc", aggregation="avg"),
+                    "max_amount": MeasureDef(column="amount_lc", aggregation="max"),
+                },
+                "aggregates": [
+                    AggregateDef(table="test_summary", dimensions=["company", "period"]),
+                ],
+            }
+        )
+
+    @pytest.mark.parametrize(
+        ("dimensions", "measures", "filters", "table"),
+        [
+            # Dimensions and filters covered by the summary table
+            (["company"], ["amount"], {"period": "2024001"}, "test_summary"),
+            # Uncovered dimension
+            (["account"], ["amount"], None, "test_table"),
+            # Uncovered filter
+            (["company"], ["amount"], {"account": "400000"}, "test_table"),
+            # Non-additive measure
+            (["company"], ["avg_amount"], None, "test_table"),
+            # The summary holds sums, so MAX over it would be wrong
+            (["company"], ["max_amount"], None, "test_table"),
+        ],
+    )
+    def test_routes_to_table(
+        self, engine, aggregated_source, dimensions, measures, filters, table
+    ):
+        sql, _ = engine._build_query(aggregated_source, dimensions, measures, filters)
+
+        assert f"FROM {table}" in sql
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(("present", "table"), [(True, "test_summary"), (False, "test_table")])
+    async def test_query_checks_aggregate_is_available(
+        self, engine, aggregated_source, mock_connector, present, table
+    ):
+        mock_connector.execute = AsyncMock(side_effect=[[{"present": present}], [], []])
+
+        await engine.query(aggregated_source, dimensions=["company"], measures=["amount"])
+        await engine.query(aggregated_source, dimensions=["period"], measures=["amount"])
+
+        # Probed once per source, then both queries read from the same table
+        probe, first, second = mock_connector.execute.call_args_list
+        assert probe.args[1] == ["test_summary"]
+        assert f"FROM {table}" in first.args[0]
+        assert f"FROM {table}" in second.args[0]
+
+    @pytest.mark.asyncio
+    async def test_query_falls_back_when_probe_fails(
+        self, engine, aggregated_source, mock_connector
+    ):
+        mock_connector.execute = AsyncMock(side_effect=[ConnectionError("probe failed"), []])
+
+        await engine.query(aggregated_source, dimensions=["company"], measures=["amount"])
+
+        assert "FROM test_table" in mock_connector.execute.call_args.args[0]
+
+    @pytest.mark.asyncio
+    async def test_query_reprobes_aggregate_after_ttl(
+        self, engine, aggregated_source, mock_connector, monkeypatch
+    ):
+        clock = [1000.0]
+        monkeypatch.setattr(query_engine.time, "monotonic", lambda: clock[0])
+        mock_connector.execute = AsyncMock(
+            side_effect=[[{"present": True}], [], [{"present": False}], []]
+        )
+
+        await engine.query(aggregated_source, dimensions=["company"], measures=["amount"])
+        # A load into the base table leaves the view stale until it is refreshed
+        clock[0] += query_engine._AGGREGATE_PROBE_TTL
+        await engine.query(aggregated_source, dimensions=["company"], measures=["amount"])
+
+        _, first, _, second = mock_connector.execute.call_args_list
+        assert "FROM test_summary" in first.args[0]
+        assert "FROM test_table" in second.args[0]
+
 
 class TestQueryResult:
     def test_query_result_creation(self):
@@ -185,3 +410,17 @@ class TestQueryResult:
         assert result.dimensions_used == ["dim1"]
         assert result.measures_used == ["measure1"]
         assert result.row_count == 1
+
+    def test_query_result_is_frozen(self):
+        """Test QueryResult fields cannot be reassigned."""
+        result = QueryResult(
+            source_name="test",
+            rows=[],
+            dimensions_used=[],
+            measures_used=[],
+            row_count=0,
+        )
+
+        with pytest.raises(FrozenInstanceError):
+            result.row_count = 5
+        assert not hasattr(result, "__dict__")
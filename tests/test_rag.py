@@ -2,23 +2,41 @@
 
 import os
 from pathlib import Path
+from unittest.mock import MagicMock
 
 import pytest
 
-from app.rag import VectorStore
+from app.rag import RAGManager, VectorStore
 
 
 class MockEmbeddings:
     """Mock embeddings for testing."""
 
     def embed_documents(self, texts: list[str]) -> list[list[float]]:
-        # Return simple mock embeddings
+        # Return simple mock embeddings, a new list per text
         return [[0.1] * 384 for _ in texts]
 
     def embed_query(self, text: str) -> list[float]:
         return [0.1] * 384
 
 
+class TestRAGManager:
+    def test_ingest_all_skills_checks_stop_between_skills(self):
+        skills = [MagicMock(knowledge_paths=["a"]), MagicMock(knowledge_paths=["b"])]
+        skills[0].name, skills[1].name = "first", "second"
+        registry = MagicMock()
+        registry.get_all_skills.return_value = skills
+        store = MagicMock()
+        store.add_documents_from_directory.return_value = 2
+        manager = RAGManager(store=store, registry=registry)
+
+        calls = iter([False, True])
+        results = manager.ingest_all_skills(stop=lambda: next(calls))
+
+        assert results == {"first": 2}
+        store.add_documents_from_directory.assert_called_once_with("a")
+
+
 # Use test database URL from environment or default to local test DB
 TEST_DATABASE_URL = os.getenv(
     "TEST_DATABASE_URL",
@@ -193,6 +193,32 @@ class TestSkillRegistry:
         assert "tool_a2" in tool_names
         assert "tool_b1" in tool_names
 
+    def test_get_all_tools_refreshes_after_registration_changes(self):
+        registry = SkillRegistry()
+        registry.register(SkillA())
+
+        assert registry.get_all_tools() is registry.get_all_tools()
+        assert isinstance(registry.get_all_tools(), tuple)
+        assert len(registry.get_all_tools()) == 2
+
+        registry.register(SkillB())
+        assert len(registry.get_all_tools()) == 3
+
+        registry.unregister("skill_a")
+        assert [t.name for t in registry.get_all_tools()] == ["tool_b1"]
+
+    def test_version_changes_on_registration(self):
+        registry = SkillRegistry()
+        initial = registry.version
+
+        registry.register(SkillA())
+        registered = registry.version
+        assert registered != initial
+        assert registry.version == registered
+
+        registry.unregister("skill_a")
+        assert registry.version not in (initial, registered)
+
     def test_get_all_skills(self):
         registry = SkillRegistry()
         registry.register(SkillA())
@@ -249,6 +275,21 @@ class TestSkillRegistry:
         assert "tool_a1" in descriptions
         assert "tool_a2" in descriptions
 
+    def test_prompt_and_descriptions_refresh_after_registration_changes(self):
+        registry = SkillRegistry()
+        registry.register(SkillA())
+
+        assert registry.get_combined_system_prompt() is registry.get_combined_system_prompt()
+        assert registry.get_tool_descriptions() is registry.get_tool_descriptions()
+
+        registry.register(SkillB())
+        assert "You are skill B." in registry.get_combined_system_prompt()
+        assert "tool_b1" in registry.get_tool_descriptions()
+
+        registry.unregister("skill_b")
+        assert "You are skill B." not in registry.get_combined_system_prompt()
+        assert "tool_b1" not in registry.get_tool_descriptions()
+
     def test_repr(self):
         registry = SkillRegistry()
         registry.register(SkillA())
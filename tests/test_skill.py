@@ -92,4 +92,33 @@ class TestSkillProtocol:
         )
         repr_str = repr(skill)
         assert "ConfiguredSkill" in repr_str
-        assert "test_skill" in repr_str
\ No newline at end of file
+        assert "test_skill" in repr_str
+
+    def test_uses_slots(self):
+        skill = ConfiguredSkill(
+            name="test_skill",
+            description="A test skill",
+            system_prompt="You are a test assistant.",
+        )
+        assert not hasattr(skill, "__dict__")
+
+    def test_get_tool_returns_first_of_duplicate_names(self):
+        first = Tool(
+            name="dummy_tool",
+            description="First",
+            function=dummy_func,
+            input_schema=DummyInput,
+        )
+        second = Tool(
+            name="dummy_tool",
+            description="Second",
+            function=dummy_func,
+            input_schema=DummyInput,
+        )
+        skill = ConfiguredSkill(
+            name="test_skill",
+            description="A test skill",
+            system_prompt="You are a test assistant.",
+            tools=[first, second],
+        )
+        assert skill.get_tool("dummy_tool") is first
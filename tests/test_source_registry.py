@@ -1,12 +1,16 @@
 """Tests for source registry."""
 
+from dataclasses import FrozenInstanceError
 
 import pytest
 import yaml
 
 from app.skills.data_analyst.source_registry import (
+    DimensionDef,
+    MeasureDef,
     SourceNotFoundError,
     SourceRegistry,
+    quote_identifier,
 )
 
 
@@ -26,6 +30,9 @@ def sample_config():
                     "amount": {"column": "amount_lc", "aggregation": "sum"},
                 },
                 "defaults": {"dimensions": ["company", "period"]},
+                "aggregates": [
+                    {"table": "table_a_by_company", "dimensions": ["company"]},
+                ],
             },
             "source_b": {
                 "description": "Test source B",
@@ -106,6 +113,15 @@ class TestSourceRegistry:
         source = registry.get("source_a")
         assert source.defaults.get("dimensions") == ["company", "period"]
 
+    def test_source_aggregates(self, registry):
+        """Test pre-aggregated tables are loaded."""
+        source = registry.get("source_a")
+        assert len(source.aggregates) == 1
+        assert source.aggregates[0].table == "table_a_by_company"
+        assert source.aggregates[0].dimensions == ["company"]
+
+        assert registry.get("source_b").aggregates == []
+
     def test_get_source_info(self, registry):
         """Test getting source info for LLM context."""
         info = registry.get_source_info()
@@ -116,6 +132,10 @@ class TestSourceRegistry:
         assert "company" in source_a_info["dimensions"]
         assert "amount" in source_a_info["measures"]
 
+    def test_get_source_info_is_cached(self, registry):
+        """Test source info is built once and reused."""
+        assert registry.get_source_info() is registry.get_source_info()
+
     def test_get_common_dimensions(self, registry):
         """Test finding common dimensions between sources."""
         common = registry.get_common_dimensions("source_a", "source_b")
@@ -123,6 +143,62 @@ class TestSourceRegistry:
         assert "period" in common
         assert "version" not in common  # Only in source_b
 
+    def test_source_name_sets(self, registry):
+        """Test dimension and measure names are exposed as frozensets."""
+        source = registry.get("source_b")
+
+        assert source.dimension_names == frozenset({"company", "period", "version"})
+        assert source.measure_names == frozenset({"amount"})
+        assert source.dimension_names is source.dimension_names
+
+    def test_source_name_sets_recomputed_on_copy(self, registry):
+        """Test model_copy does not carry over name sets of the original."""
+        source = registry.get("source_b")
+        assert "extra" not in source.measure_names
+
+        copy = source.model_copy(
+            update={"measures": {**source.measures, "extra": MeasureDef(column="extra")}}
+        )
+
+        assert copy.measure_names == frozenset({"amount", "extra"})
+        assert source.measure_names == frozenset({"amount"})
+
+    def test_get_common_dimensions_cached_per_pair(self, registry):
+        """Test both argument orders share one cached result."""
+        first = registry.get_common_dimensions("source_a", "source_b")
+        second = registry.get_common_dimensions("source_b", "source_a")
+
+        assert first == second == ["company", "period"]
+        assert list(registry._common_dims_cache) == [("source_a", "source_b")]
+
+    def test_get_comparison_pairs(self, registry):
+        """Test pairs list sources sharing dimensions and is built once."""
+        pairs = registry.get_comparison_pairs()
+
+        assert pairs == [
+            {
+                "source_a": "source_a",
+                "source_b": "source_b",
+                "common_dimensions": ["company", "period"],
+            }
+        ]
+        assert registry.get_comparison_pairs() is pairs
+
+    def test_get_common_dimensions_follows_smaller_source(self, registry):
+        """Test results use the config order of the source with fewer dimensions."""
+        common = registry.get_common_dimensions("source_b", "source_a")
+        assert common == list(registry.get("source_a").dimensions)
+
+    def test_get_common_dimensions_same_source(self, registry):
+        """Test a source shares all of its dimensions with itself."""
+        common = registry.get_common_dimensions("source_b", "source_b")
+        assert common == ["company", "period", "version"]
+
+    def test_get_common_dimensions_unknown_source(self, registry):
+        """Test unknown sources still raise."""
+        with pytest.raises(SourceNotFoundError):
+            registry.get_common_dimensions("source_a", "missing")
+
     def test_comparison_config(self, registry):
         """Test comparison config is loaded."""
         config = registry.comparison_config
@@ -132,12 +208,58 @@ class TestSourceRegistry:
         assert "match" in config.thresholds
         assert config.thresholds["match"].absolute == 100
 
+    def test_dimension_values_loaded_as_tuple(self, sample_config, tmp_path):
+        """Test dimension value lists become tuples on frozen definitions."""
+        sample_config["sources"]["source_b"]["dimensions"]["version"] = {
+            "column": "version",
+            "values": ["ACT", "PLN"],
+        }
+        config_path = tmp_path / "sources.yaml"
+        config_path.write_text(yaml.dump(sample_config))
+
+        version = SourceRegistry(config_path).get("source_b").dimensions["version"]
+
+        assert version.values == ("ACT", "PLN")
+        with pytest.raises(FrozenInstanceError):
+            version.column = "other"
+
+    def test_dimension_without_column_raises(self, sample_config, tmp_path):
+        """Test a dimension entry missing its column is rejected at load."""
+        sample_config["sources"]["source_a"]["dimensions"]["company"] = {"type": "string"}
+        config_path = tmp_path / "sources.yaml"
+        config_path.write_text(yaml.dump(sample_config))
+
+        with pytest.raises(ValueError, match="dimension 'company' has no column"):
+            SourceRegistry(config_path)
+
     def test_file_not_found(self, tmp_path):
         """Test error when config file doesn't exist."""
         with pytest.raises(FileNotFoundError):
             SourceRegistry(tmp_path / "nonexistent.yaml")
 
 
+class TestQuoteIdentifier:
+    @pytest.mark.parametrize(
+        ("name", "expected"),
+        [
+            ("comp_code", "comp_code"),
+            ("_col1", "_col1"),
+            ("CompCode", '"CompCode"'),
+            ("gl account", '"gl account"'),
+            ("1col", '"1col"'),
+            ('we"ird', '"we""ird"'),
+        ],
+    )
+    def test_quote_identifier(self, name, expected):
+        assert quote_identifier(name) == expected
+
+    def test_defs_expose_quoted_column(self):
+        assert DimensionDef(column="CompCode").quoted_column == '"CompCode"'
+        assert MeasureDef(column="amount_lc").quoted_column == "amount_lc"
+        # Derived once at construction, not part of equality
+        assert DimensionDef(column="CompCode") == DimensionDef(column="CompCode")
+
+
 class TestSourceRegistryWithRealConfig:
     """Test with the actual project config file."""
 
@@ -159,6 +281,9 @@ class TestSourceRegistryWithRealConfig:
         assert "period" in fi.dimensions
         assert "account" in fi.dimensions
 
+        # Summary view routing is opt-in
+        assert fi.aggregates == []
+
     def test_real_config_common_dimensions(self):
         """Test common dimensions between real sources."""
         registry = SourceRegistry("config/sources.yaml")